@@ -0,0 +1,22 @@
+# Gunicorn settings, overridable from the environment.
+#
+# By default the ASGI application (job_platform.asgi) runs in uvicorn workers:
+# each worker serves many requests concurrently on one event loop instead of
+# blocking a whole process per in-flight request. For the WSGI application set
+# GUNICORN_WORKER_CLASS=sync (or gthread) and point gunicorn at job_platform.wsgi.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Threads per worker for the gthread worker class (ignored by uvicorn workers)
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+# Access log destination, '-' for stdout; empty disables it
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
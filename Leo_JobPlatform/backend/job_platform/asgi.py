@@ -0,0 +1,9 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+application = get_asgi_application()
+
+# Serving processes keep Job.status current in-process when configured
+from jobs.scheduler import start_configured_scheduler  # noqa: E402
+start_configured_scheduler()
@@ -0,0 +1,72 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+# Whether ORM reads of the current request (or task) may go to a read replica.
+# A ContextVar follows the request into sync_to_async threads, so it works for
+# sync and async views alike.
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+@contextmanager
+def read_replica():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+# Undo read_replica() for a block that must see the primary, e.g. filling a shared
+# cache that outlives the replication delay
+@contextmanager
+def read_primary():
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+# Route a read-only view's queries to a replica. Views without it, and all writes,
+# stay on the primary, so write paths always read their own writes.
+def reads_from_replica(view):
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def inner(*args, **kwargs):
+            with read_replica():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def inner(*args, **kwargs):
+            with read_replica():
+                return view(*args, **kwargs)
+    return inner
+
+
+# Sends reads inside read_replica() to a random configured replica and everything
+# else to the default database. Replicas share the primary's schema, so
+# migrations only run on the primary.
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            aliases = replica_aliases()
+            if aliases:
+                return random.choice(aliases)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
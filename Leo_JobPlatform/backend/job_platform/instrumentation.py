@@ -0,0 +1,235 @@
+import hmac
+import ipaddress
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Aggregated request and database metrics of this process. Every worker process
+# keeps its own registry; a Prometheus server scrapes and sums them per instance.
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.requests = defaultdict(int)  # (endpoint, method, status) -> count
+        self.latency_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))  # (endpoint, method)
+        self.latency_sum = defaultdict(float)
+        self.latency_count = defaultdict(int)
+        self.db_queries = defaultdict(int)  # (endpoint, method) -> count
+        self.db_seconds = defaultdict(float)
+        self.slow_queries = defaultdict(int)
+
+    def observe(self, endpoint, method, status, duration, queries, db_duration, slow):
+        key = (endpoint, method)
+        with self._lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            buckets = self.latency_buckets[key]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    buckets[i] += 1
+            self.latency_sum[key] += duration
+            self.latency_count[key] += 1
+            self.db_queries[key] += queries
+            self.db_seconds[key] += db_duration
+            if slow:
+                self.slow_queries[key] += slow
+
+    def collect(self):
+        with self._lock:
+            yield ("http_requests_total", "counter", "Requests by endpoint, method and status code", [
+                ({"endpoint": e, "method": m, "status": s}, count)
+                for (e, m, s), count in sorted(self.requests.items())
+            ])
+            samples = []
+            for (e, m), buckets in sorted(self.latency_buckets.items()):
+                labels = {"endpoint": e, "method": m}
+                for bound, count in zip(LATENCY_BUCKETS, buckets):
+                    samples.append(({**labels, "le": str(bound)}, count, "_bucket"))
+                samples.append(({**labels, "le": "+Inf"}, self.latency_count[(e, m)], "_bucket"))
+                samples.append((labels, self.latency_sum[(e, m)], "_sum"))
+                samples.append((labels, self.latency_count[(e, m)], "_count"))
+            yield ("http_request_duration_seconds", "histogram", "Request latency", samples)
+            for name, kind, help_text, values in (
+                ("db_queries_total", "counter", "Database queries run while serving requests", self.db_queries),
+                ("db_query_duration_seconds_total", "counter", "Time spent in database queries", self.db_seconds),
+                ("db_slow_queries_total", "counter", "Queries slower than SLOW_QUERY_THRESHOLD_MS", self.slow_queries),
+            ):
+                yield (name, kind, help_text, [
+                    ({"endpoint": e, "method": m}, value) for (e, m), value in sorted(values.items())
+                ])
+
+
+metrics = Metrics()
+
+# Callables yielding extra (name, type, help, samples) metric families, e.g. cache stats
+_collectors = []
+
+
+def register_collector(collector):
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+# Render every metric family in the Prometheus text exposition format
+def render_metrics() -> str:
+    lines = []
+    families = [metrics.collect()] + [collector() for collector in _collectors]
+    for family in families:
+        for name, kind, help_text, samples in family:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value, *suffix in samples:
+                lines.append(f"{name}{suffix[0] if suffix else ''}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# Whether a request may read /metrics: a client address inside METRICS_ALLOWED_IPS,
+# or an `Authorization: Bearer <METRICS_TOKEN>` header when a token is configured
+def metrics_allowed(request) -> bool:
+    token = settings.METRICS_TOKEN
+    if token:
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip(), token):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# Per-request statistics gathered by the connection.execute_wrapper hook
+class QueryRecorder:
+    def __init__(self, threshold_ms: float):
+        self.threshold = threshold_ms / 1000
+        self.count = 0
+        self.duration = 0.0
+        self.slow = []  # (alias, sql, params, seconds)
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.count += 1
+                self.duration += elapsed
+                if elapsed >= self.threshold:
+                    self.slow.append((alias, sql, None if many else params, elapsed))
+        return record
+
+
+# Times every request, counts its queries and database time on all connections,
+# adds a Server-Timing header and feeds the /metrics registry. Queries slower than
+# SLOW_QUERY_THRESHOLD_MS are logged, SELECTs with their EXPLAIN plan.
+# Runs natively under both WSGI and ASGI, so async views are not forced onto a thread.
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder(settings.SLOW_QUERY_THRESHOLD_MS)
+        started = time.perf_counter()
+        with self.record_queries(recorder):
+            response = self.get_response(request)
+        self.finish(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder(settings.SLOW_QUERY_THRESHOLD_MS)
+        started = time.perf_counter()
+        # Database connections are per thread and the async ORM runs queries on
+        # the request's sync_to_async thread, so the wrappers are installed there
+        stack = await sync_to_async(self.record_queries)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        duration = time.perf_counter() - started
+        if recorder.slow:  # EXPLAIN needs the database
+            await sync_to_async(self.finish)(request, response, recorder, duration)
+        else:
+            self.finish(request, response, recorder, duration)
+        return response
+
+    def record_queries(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder.wrapper(connection.alias)))
+        return stack
+
+    def finish(self, request, response, recorder, duration):
+        endpoint = self.endpoint(request)
+        for alias, sql, params, elapsed in recorder.slow:
+            self.log_slow_query(endpoint, alias, sql, params, elapsed)
+
+        metrics.observe(
+            endpoint, request.method, response.status_code, duration,
+            recorder.count, recorder.duration, len(recorder.slow),
+        )
+        response["Server-Timing"] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries", '
+            f"app;dur={(duration - recorder.duration) * 1000:.1f}, "
+            f"total;dur={duration * 1000:.1f}"
+        )
+
+    # URL pattern of the matched route, so /api/jobs/1 and /api/jobs/2 share a series
+    def endpoint(self, request) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unmatched"
+        return "/" + match.route
+
+    def log_slow_query(self, endpoint, alias, sql, params, elapsed):
+        plan = ""
+        if settings.SLOW_QUERY_EXPLAIN and params is not None and sql.lstrip().upper().startswith("SELECT"):
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("EXPLAIN " + sql, params)
+                    plan = "\n" + "\n".join(row[0] for row in cursor.fetchall())
+            except Exception as e:  # never fail the request over its diagnostics
+                plan = f"\n(EXPLAIN failed: {e})"
+        logger.warning("Slow query (%.1fms) in %s: %s; params=%r%s", elapsed * 1000, endpoint, sql, params, plan)
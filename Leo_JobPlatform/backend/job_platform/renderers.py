@@ -0,0 +1,18 @@
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+import orjson
+
+_fallback_encoder = NinjaJSONEncoder()
+
+
+# Serialize to JSON with orjson; types it doesn't know natively
+# fall back to the encoder of ninja's default renderer
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_fallback_encoder.default, option=orjson.OPT_UTC_Z)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def render(self, request, data, *, response_status):
+        return dumps(data)
@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'your-secret-key'
@@ -13,12 +14,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'ninja_extra',
     'jobs',
     'corsheaders',
 ]
 
 MIDDLEWARE = [
+    # First, so its timings and query counts cover the whole middleware stack
+    'job_platform.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -48,23 +52,111 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'job_platform.wsgi.application'
+ASGI_APPLICATION = 'job_platform.asgi.application'
 
-DATABASES = {
-    'default': {
+# Connection reuse. By default connections come from psycopg 3's connection pool
+# (one per process), which suits ASGI: requests run their ORM calls on short-lived
+# threads, so per-thread persistent connections would never be reused and would
+# pile up. DB_POOL=false opens a connection per request instead, or keeps it for
+# DB_CONN_MAX_AGE seconds (for WSGI sync workers only; health-checked before reuse).
+DB_POOL = os.environ.get('DB_POOL', 'true').lower() in ('1', 'true', 'yes')
+
+def database(host):
+    config = {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.environ.get('POSTGRES_DB', 'job_platform_db'),
         'USER': os.environ.get('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'postgres'),
-        'HOST': os.environ.get('POSTGRES_HOST', 'db'),
-        'PORT': '5432',
+        'HOST': host,
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
     }
+    if DB_POOL:
+        config['OPTIONS'] = {'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        }}
+    else:
+        config['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '0'))
+    # Persistent connections are pinged before reuse; pooled ones on checkout
+    config['CONN_HEALTH_CHECKS'] = True
+    return config
+
+DATABASES = {
+    'default': database(os.environ.get('POSTGRES_HOST', 'db')),
 }
 
+# Read replicas (comma-separated hosts, same credentials). Endpoints marked with
+# job_platform.db_router.reads_from_replica read from them; everything else uses the primary,
+# as do response cache fills (jobs.cache).
+for index, host in enumerate(filter(None, os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {**database(host.strip()), 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['job_platform.db_router.ReplicaRouter']
+
+# Cache backend for pre-serialized job responses: "file" (default, shared by the
+# worker processes of one host), "redis" (shared across hosts, needs the `redis`
+# package; configure maxmemory-policy allkeys-lru on the server) or "locmem" (per
+# process, LRU). Writes invalidate by bumping generation keys in the cache, which
+# other processes never see with locmem, so it only suits a single process and
+# keeps the response cache off unless JOBS_CACHE_TIMEOUT is set explicitly.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+CACHE_LOCATIONS = {
+    'locmem': 'job-platform',
+    'file': os.path.join(tempfile.gettempdir(), 'job-platform-cache'),
+    'redis': 'redis://localhost:6379/0',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+    }
+}
+if CACHE_BACKEND != 'redis':
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '10000'))}
+
+# Seconds a cached job listing/detail response is kept (0 disables the response cache)
+JOBS_CACHE_TIMEOUT = int(os.environ.get('JOBS_CACHE_TIMEOUT', '0' if CACHE_BACKEND == 'locmem' else '300'))
+# Seconds cached facet counts are kept; short, since facets span every page of a listing
+JOBS_FACETS_CACHE_TIMEOUT = int(os.environ.get('JOBS_FACETS_CACHE_TIMEOUT', '30'))
+
+# Largest listing page; page_size<=0 ("everything") is capped at it too
+JOBS_MAX_PAGE_SIZE = int(os.environ.get('JOBS_MAX_PAGE_SIZE', '1000'))
+
+# Change feed (/api/jobs/changes): deleted-job tombstones are kept for the
+# retention period; older cursors get 410.
+JOBS_CHANGES_POLL_SECONDS = float(os.environ.get('JOBS_CHANGES_POLL_SECONDS', '2'))
+JOBS_CHANGES_STREAM_SECONDS = float(os.environ.get('JOBS_CHANGES_STREAM_SECONDS', '300'))
+JOBS_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('JOBS_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Jobs that expired more than this many days ago are moved to the archive table by archive_jobs
+JOBS_ARCHIVE_AFTER_DAYS = int(os.environ.get('JOBS_ARCHIVE_AFTER_DAYS', '90'))
+
+# Queries slower than this (milliseconds) are logged by InstrumentationMiddleware,
+# SELECTs together with their EXPLAIN plan unless SLOW_QUERY_EXPLAIN is off
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '200'))
+SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() in ('1', 'true', 'yes')
+
+# /metrics is served to clients in METRICS_ALLOWED_IPS (comma-separated addresses or
+# networks, local only by default) and to requests bearing METRICS_TOKEN, if set
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+# Seconds between in-process job status transitions (scheduled -> active -> expired).
+# Only server processes (job_platform.asgi / wsgi) run it, never management commands.
+# 0 disables the in-process runner; use `manage.py update_job_status` from cron instead.
+JOB_STATUS_SCHEDULER_INTERVAL = int(os.environ.get('JOB_STATUS_SCHEDULER_INTERVAL', '0'))
+
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -93,8 +185,16 @@ CORS_ALLOW_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'if-match',  # optimistic concurrency on PATCH /api/jobs/{id}
     'origin',
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
-]
\ No newline at end of file
+]
+
+# Let the frontend read the validators used for conditional requests and the Server-Timing breakdown
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'last-modified',
+    'server-timing',
+]
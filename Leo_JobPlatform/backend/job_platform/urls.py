@@ -2,11 +2,14 @@ from django.contrib import admin
 from django.urls import path
 from ninja import NinjaAPI
 from jobs.apis import router as jobs_router
+from .instrumentation import metrics_view
+from .renderers import ORJSONRenderer
 
-api = NinjaAPI()
+api = NinjaAPI(renderer=ORJSONRenderer())
 api.add_router("/", jobs_router, tags=["jobs"])
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('metrics', metrics_view),
 ]
\ No newline at end of file
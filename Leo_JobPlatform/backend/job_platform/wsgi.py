@@ -3,3 +3,7 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
 application = get_wsgi_application()
+
+# Serving processes keep Job.status current in-process when configured
+from jobs.scheduler import start_configured_scheduler  # noqa: E402
+start_configured_scheduler()
@@ -1,114 +1,740 @@
 from typing import List
 from ninja import Router, Query
-from django.shortcuts import get_object_or_404
-from django.db import models
+from django.shortcuts import aget_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.db import connections, models, router as db_router
+from django.db.models.functions import Least
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_etags
+from asgiref.sync import sync_to_async
+from functools import wraps
+from ninja.decorators import decorate_view
+from pydantic import ValidationError as SchemaValidationError
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
-from .models import Job
-from .schemas import JobSchema, JobCreateSchema, JobQueryParams, PaginatedResponse
+from ninja.errors import HttpError
+from .models import Company, Job, JobArchive, LOOKUP_FIELDS, Location, SEARCH_CONFIG, status_expression, to_date
+from .pagination import COUNT_STRATEGIES, count_rows, paginate_by_cursor
+from .schemas import (
+    JobSchema, JobSummarySchema, JobCreateSchema, JobQueryParams, PaginatedResponse,
+    JobMatchQueryParams, JobMatchResponse, BulkCreateResponse, JobBulkSelector, JobBulkChanges,
+    JobBulkUpdateSchema, BulkUpdateResponse, BulkDeleteResponse, JobPatchSchema, JobExportParams,
+    JobChangesParams, JobChangesResponse, JobSimilarParams, JobSimilarResponse, LookupNameSchema, LookupNameParams, LookupAutocompleteParams,
+)
+from .ingest import ingest_jobs, iter_ndjson
+from .cache import (
+    acached_response, acached_value, adetail_cache_key, alist_cache_key, cache_enabled, cached_response,
+    cached_value, invalidate_all, invalidate_job, list_cache_key,
+)
+from .salary import parse_salary_range
+from .facets import compute_facets, parse_facets
+from .export import EXPORT_FORMATS, export_response
+from .similarity import similar_jobs
+from .changes import MAX_CHANGES_LIMIT, encode_change_cursor, fetch_changes, resolve_position, stream_changes
+from django.conf import settings
+from job_platform.db_router import reads_from_replica
+import hashlib
+import json
 import math
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
 
 router = Router()
 
 # Create a new job posting
 @router.post("/jobs", response=JobSchema)
-def create_job(request, payload: JobCreateSchema):
+async def create_job(request, payload: JobCreateSchema):
     try:
-        job = Job.objects.create(**payload.dict())
+        job = await Job.objects.acreate(**payload.dict())
         return job
     except IntegrityError as e:
         raise ValidationError("Invalid job data: " + str(e))
     except Exception as e:
         raise ValidationError("Failed to create job: " + str(e))
 
-# List jobs with filtering, sorting and pagination
-@router.get("/jobs", response=PaginatedResponse)
-def list_jobs(request, params: JobQueryParams = Query(...)):
+# Create many job postings in one request.
+# Accepts a JSON array of JobCreateSchema objects, or NDJSON (Content-Type:
+# application/x-ndjson) which is streamed line by line. Invalid rows are reported
+# in `errors` and skipped; the valid rows are written with batched COPY statements.
+@router.post("/jobs/bulk", response=BulkCreateResponse)
+def bulk_create_jobs(request):
     try:
-        qs = Job.objects.all()
+        if request.content_type in ("application/x-ndjson", "application/ndjson"):
+            rows = iter_ndjson(request)
+        else:
+            try:
+                rows = json.load(request)
+            except ValueError:
+                raise HttpError(400, "Request body must be a JSON array or NDJSON")
+            if not isinstance(rows, list):
+                raise HttpError(400, "Request body must be a JSON array or NDJSON")
 
-        # Apply search filters
-        if params.search:
-            qs = qs.filter(
-                models.Q(title__icontains=params.search) |
-                models.Q(description__icontains=params.search) |
-                models.Q(company__icontains=params.search)
-            )
+        created, errors = ingest_jobs(rows)
+        return {"created": created, "errors": errors}
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to create jobs: " + str(e))
+
+# Jobs whose company/location name contains `value`. The names are matched in the
+# small lookup table first (trigram index) and jobs_job is filtered by integer key;
+# literal keys let the planner estimate the match from the column statistics, and
+# an empty match drops the condition altogether.
+def name_contains(name: str, value: str) -> models.Q:
+    keys = LOOKUP_FIELDS[name].objects.filter(name__trgm_icontains=value).values_list("id", flat=True)
+    return models.Q(**{f"{name}_ref_id__in": list(keys)})
+
+# Build an index-eligible substring predicate for the search box.
+# `trgm_icontains` compiles to `col ILIKE '%term%'`, which PostgreSQL answers
+# from the pg_trgm GIN indexes instead of scanning every row of jobs_job.
+def build_search_query(search: str) -> models.Q:
+    return (
+        models.Q(title__trgm_icontains=search) |
+        models.Q(description__trgm_icontains=search) |
+        name_contains("company", search)
+    )
+
+# Match the search box against the stored, weighted Job.search_vector and
+# annotate each row with its relevance so results can be ranked
+def apply_fulltext_search(qs, search: str):
+    query = SearchQuery(search, search_type="websearch", config=SEARCH_CONFIG)
+    return qs.filter(search_vector=query).annotate(
+        rank=SearchRank(models.F("search_vector"), query)
+    )
+
+# Normalize repeated and/or comma-separated skill parameters to a unique list
+def parse_skills(values) -> List[str]:
+    skills = (skill.strip() for value in values or [] for skill in value.split(","))
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+# Parse listing parameters from the query string outside of an endpoint
+# (e.g. in conditional request validators), keeping multi-valued parameters
+def parse_query_params(schema, request):
+    return schema(**{
+        key: values if key in schema.LIST_PARAMS else values[-1]
+        for key, values in request.GET.lists()
+    })
+
+# Apply the JobQueryParams filters shared by the listing endpoints. Name filters
+# query the lookup tables, so async views call this through sync_to_async.
+def filter_jobs(qs, params: JobQueryParams):
+    # Apply search filters
+    if params.search:
+        if params.search_mode == "fulltext":
+            qs = apply_fulltext_search(qs, params.search)
+        else:
+            qs = qs.filter(build_search_query(params.search))
+
+    # Apply status filter; stored statuses are lowercase, so an exact match on the
+    # normalized value can use the (status, ...) indexes where iexact cannot
+    if params.status:
+        qs = qs.filter(status=params.status.strip().lower())
+
+    # Apply location and company filters: substring matches on the name, or the exact key
+    if params.location:
+        qs = qs.filter(name_contains("location", params.location))
+    if params.company:
+        qs = qs.filter(name_contains("company", params.company))
+    if params.location_id is not None:
+        qs = qs.filter(location_ref_id=params.location_id)
+    if params.company_id is not None:
+        qs = qs.filter(company_ref_id=params.company_id)
+
+    # Apply skill filters; && and @> are answered from the GIN index on required_skills
+    skills_any = parse_skills(params.skills_any)
+    if skills_any:
+        qs = qs.filter(required_skills__overlap=skills_any)
+    skills_all = parse_skills(params.skills_all)
+    if skills_all:
+        qs = qs.filter(required_skills__contains=skills_all)
 
-        # Apply status filter
-        if params.status:
-            qs = qs.filter(status__iexact=params.status)
-
-        # Apply location and company filters
-        if params.location:
-            qs = qs.filter(location__icontains=params.location)
-        if params.company:
-            qs = qs.filter(company__icontains=params.company)
-
-        # Apply sorting
-        if params.order_by == "posting_date":
-            qs = qs.order_by("-posting_date")  # newest first
-        elif params.order_by == "expiration_date":
-            qs = qs.order_by("expiration_date")  # earliest expiration first
-
-        # Calculate pagination
-        total = qs.count()
-        if params.page_size <= 0:
-            params.page_size = total  # return all items if page_size is invalid
-        
-        total_pages = math.ceil(total / params.page_size) if params.page_size > 0 else 1
-        
-        # Validate page number
-        if params.page < 1:
-            params.page = 1
-        elif params.page > total_pages and total_pages > 0:
-            params.page = total_pages
-        
-        # Get paginated results
-        start = (params.page - 1) * params.page_size
-        end = start + params.page_size
-        items = list(qs[start:end])
-        
+    # Apply salary filters on the parsed bounds (job_salary_max_idx / job_salary_min_idx)
+    if params.salary_min is not None:
+        qs = qs.filter(salary_max__gte=params.salary_min)
+    if params.salary_max is not None:
+        qs = qs.filter(salary_min__lte=params.salary_max)
+    if params.currency:
+        qs = qs.filter(currency=params.currency.strip().upper())
+
+    return qs
+
+# Fields a listing can be projected to with `fields=`
+LISTABLE_FIELDS = list(JobSchema.model_fields)
+SUMMARY_FIELDS = list(JobSummarySchema.model_fields)
+
+# Resolve the `fields` parameter to the projected columns (None for full JobSchema items)
+def parse_fields(value):
+    if not value:
+        return None
+    if value.strip() == "summary":
+        return SUMMARY_FIELDS
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(fields) - set(LISTABLE_FIELDS))
+    if unknown:
+        raise HttpError(400, "Unknown fields: " + ", ".join(unknown))
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return fields
+
+# Build one PaginatedResponse page for the listing parameters. With a field
+# projection the items are plain dicts read with .values(), skipping model
+# instantiation and schema validation.
+async def build_job_page(params: JobQueryParams, fields=None):
+    qs = await sync_to_async(filter_jobs)(Job.objects.defer("search_vector"), params)
+    if fields:
+        # The date columns are always read, cursor pagination needs them
+        qs = qs.values_with_names(*dict.fromkeys([*fields, "posting_date", "expiration_date"]))
+
+    facets = parse_facets(params.facets)
+    page = await paginate_jobs(qs, params)
+    if fields:
+        page["items"] = [{name: row[name] for name in fields} for row in page["items"]]
+    if facets:
+        page["facets"] = await sync_to_async(job_facets)(params, facets)
+    return page
+
+# Listing parameters that only shape the page, not the filtered set
+PAGE_PARAMS = ("order_by", "page", "page_size", "pagination", "cursor", "count", "fields", "facets")
+
+# Facet counts for the current filters. They are cached apart from the page,
+# keyed on the filters alone, so paging through a result set reuses them.
+def job_facets(params: JobQueryParams, names):
+    filters = JobQueryParams(**params.dict(exclude=set(PAGE_PARAMS)))
+    key = f"{list_cache_key(filters, namespace='facets')}:{','.join(names)}"
+    return cached_value(
+        key,
+        lambda: compute_facets(filter_jobs(Job.objects.all(), filters), names),
+        timeout=settings.JOBS_FACETS_CACHE_TIMEOUT,
+    )
+
+# Sort order of the order_by parameter (id breaks ties so pages never overlap)
+def job_ordering(params: JobQueryParams):
+    if params.order_by == "posting_date":
+        ordering = ["-posting_date", "-id"]  # newest first
+    elif params.order_by == "expiration_date":
+        ordering = ["expiration_date", "id"]  # earliest expiration first
+    elif params.order_by == "salary":
+        ordering = [models.F("salary_max").desc(nulls_last=True), "-id"]  # highest pay first
+    else:
+        ordering = list(Job._meta.ordering)
+    if params.search and params.search_mode == "fulltext":
+        ordering.insert(0, "-rank")  # most relevant first, then the requested order
+    return ordering
+
+# Sort and paginate the filtered listing queryset
+async def paginate_jobs(qs, params: JobQueryParams):
+    # Keyset pagination: each page costs the same regardless of depth
+    if params.cursor or params.pagination == "cursor":
+        if params.search and params.search_mode == "fulltext":
+            raise HttpError(400, "Cursor pagination is not supported for fulltext search")
+        if params.order_by == "salary":
+            raise HttpError(400, "Cursor pagination is not supported for order_by=salary")
+        items, next_cursor, page_size = await paginate_by_cursor(
+            qs, params.order_by, params.cursor, min(params.page_size, settings.JOBS_MAX_PAGE_SIZE)
+        )
         return {
             "items": items,
-            "total": total,
-            "page": params.page,
-            "page_size": params.page_size,
-            "total_pages": total_pages
+            "total": await count_rows(qs, params.count or "none"),
+            "page_size": page_size,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor,
         }
+
+    qs = qs.order_by(*job_ordering(params))
+
+    # Return all items if page_size is invalid, as long as they fit on one page of
+    # JOBS_MAX_PAGE_SIZE (the count then comes for free). Larger sets are paginated
+    # at that size instead of materialized; /jobs/export streams all of them.
+    max_page_size = settings.JOBS_MAX_PAGE_SIZE
+    if params.page_size <= 0:
+        items = [job async for job in qs[:max_page_size + 1]]
+        if len(items) <= max_page_size:
+            return {
+                "items": items,
+                "total": len(items),
+                "page": 1,
+                "page_size": len(items),
+                "total_pages": 1,
+                "has_next": False,
+            }
+    params.page_size = min(params.page_size, max_page_size) if params.page_size > 0 else max_page_size
+
+    # Calculate pagination
+    count = params.count or "exact"
+    total = await count_rows(qs, count)
+    total_pages = math.ceil(total / params.page_size) if total is not None else None
+
+    # Validate page number (an estimated total is not reliable enough to clamp to)
+    if params.page < 1:
+        params.page = 1
+    elif count == "exact" and params.page > total_pages and total_pages > 0:
+        params.page = total_pages
+
+    # Get paginated results; one extra row tells whether another page follows
+    start = (params.page - 1) * params.page_size
+    end = start + params.page_size
+    rows = [job async for job in qs[start:end + 1]]
+    items = rows[:params.page_size]
+
+    return {
+        "items": items,
+        "total": total,
+        "page": params.page,
+        "page_size": params.page_size,
+        "total_pages": total_pages,
+        "has_next": len(rows) > params.page_size,
+    }
+
+# Conditional request validators of a listing: the ETag is derived from its
+# response cache key, i.e. the listing generation (bumped by every write) and the
+# normalized parameters, so revalidating costs no query. No Last-Modified: no
+# cheap timestamp reflects deletes, so only If-None-Match can answer 304.
+# Without the response cache the generation is not maintained; no validators then.
+async def list_validators(request):
+    if not cache_enabled():
+        return None, None
+    try:
+        params = parse_query_params(JobQueryParams, request)
+    except SchemaValidationError:
+        return None, None  # let the endpoint report the error
+    key = await alist_cache_key(params)
+    return hashlib.sha1(key.encode()).hexdigest(), None
+
+# Conditional request validators of a single job, derived from updated_at
+# A job's ETag encodes its exact updated_at, so it doubles as the version
+# checked by optimistic concurrency control in patch_job
+def job_etag(job_id: int, updated_at) -> str:
+    return f"{job_id}-{updated_at.timestamp():.6f}"
+
+# The updated_at an If-Match header refers to, or None for "*" (any version)
+def parse_if_match(header: str, job_id: int):
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return None
+    for etag in etags:
+        job, _, seconds = etag.removeprefix("W/").strip('"').partition("-")
+        if job == str(job_id):
+            try:
+                seconds = Decimal(seconds)
+            except InvalidOperation:
+                break
+            # Decimal keeps the microseconds a float could round off
+            return datetime.fromtimestamp(int(seconds), tz=dt_timezone.utc) + timedelta(
+                microseconds=int(seconds % 1 * 1_000_000)
+            )
+    raise HttpError(412, "If-Match does not match this job")
+
+async def job_validators(request, job_id: int):
+    async def build():
+        updated_at = await Job.objects.filter(id=job_id).values_list("updated_at", flat=True).afirst()
+        if updated_at is None:
+            updated_at = await JobArchive.objects.filter(id=job_id).values_list("updated_at", flat=True).afirst()
+        if updated_at is None:
+            return None
+        return job_etag(job_id, updated_at), updated_at
+
+    return await acached_value(f"{await adetail_cache_key(job_id)}:validators", build) or (None, None)
+
+# Async counterpart of django.views.decorators.http.condition, whose validator
+# callables must be synchronous: `validators` is a coroutine function returning
+# (etag, last_modified) for the view's arguments. Answers 304/412 when the
+# request's preconditions match and sets ETag/Last-Modified on GET/HEAD responses.
+def conditional(validators):
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await validators(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+        return inner
+    return decorator
+
+# List jobs with filtering, sorting and pagination, read from a replica when configured
+# and the response cache is off (cache fills read the primary, see jobs.cache).
+# Pages are served from the response cache, keyed on the normalized parameters,
+# and revalidated with If-None-Match / If-Modified-Since (304 Not Modified).
+@router.get("/jobs", response=PaginatedResponse)
+@decorate_view(reads_from_replica)
+@decorate_view(conditional(list_validators))
+async def list_jobs(request, params: JobQueryParams = Query(...)):
+    try:
+        fields = parse_fields(params.fields)
+        if params.count and params.count not in COUNT_STRATEGIES:
+            raise HttpError(400, "count must be one of: " + ", ".join(COUNT_STRATEGIES))
+        return await acached_response(
+            await alist_cache_key(params), "list",
+            None if fields else PaginatedResponse,
+            lambda: build_job_page(params, fields),
+        )
+    except HttpError:
+        raise
     except Exception as e:
         raise ValidationError("Failed to fetch jobs: " + str(e))
 
-# Get a single job by ID
+# Top-K jobs sharing the most skills with a candidate's skill list.
+# Only jobs overlapping the list (GIN && lookup) are scored; when enough jobs
+# require every listed skill they are the top scores and scoring is skipped.
+MAX_MATCH_LIMIT = 100
+
+def match_jobs(params: JobMatchQueryParams, skills: List[str]):
+    limit = min(max(params.limit, 1), MAX_MATCH_LIMIT)
+    qs = Job.objects.all()
+    if params.status:
+        qs = qs.filter(status=params.status.strip().lower())
+
+    # Ties are broken by the job needing the fewest other skills, then recency
+    qs = qs.annotate(skill_count=models.Func("required_skills", function="cardinality"))
+    tie_breakers = ["skill_count", "-posting_date", "-id"]
+
+    full_matches = list(
+        qs.filter(required_skills__contains=skills)
+        .order_by(*tie_breakers)
+        .values_with_names(*SUMMARY_FIELDS)[:limit]
+    )
+    if len(full_matches) == limit:
+        rows = full_matches
+    else:
+        score = models.expressions.RawSQL(
+            "cardinality(ARRAY(SELECT unnest(required_skills) INTERSECT SELECT unnest(%s::varchar[])))",
+            (skills,),
+        )
+        rows = list(
+            qs.filter(required_skills__overlap=skills)
+            .annotate(score=score)
+            .order_by("-score", *tie_breakers)
+            .values_with_names(*SUMMARY_FIELDS)[:limit]
+        )
+
+    wanted = set(skills)
+    items = []
+    for row in rows:
+        matched = [skill for skill in row["required_skills"] if skill in wanted]
+        items.append({**row, "score": len(matched), "matched_skills": matched})
+    return {"items": items}
+
+@router.get("/jobs/match", response=JobMatchResponse)
+@decorate_view(reads_from_replica)
+def match_jobs_by_skills(request, params: JobMatchQueryParams = Query(...)):
+    try:
+        skills = parse_skills(params.skills)
+        if not skills:
+            raise HttpError(400, "At least one skill is required")
+        return cached_response(
+            list_cache_key(params, "match"), "list", None, lambda: match_jobs(params, skills)
+        )
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to match jobs: " + str(e))
+
+# Stream every job matching the list_jobs filters as NDJSON (default) or CSV, in
+# the order_by order and projected to `fields`; pagination parameters are ignored.
+# Rows are read through a server-side cursor and written chunk by chunk, so memory
+# stays flat however many jobs match.
+@router.get("/jobs/export")
+@decorate_view(reads_from_replica)
+async def export_jobs(request, params: JobExportParams = Query(...)):
+    try:
+        if params.format not in EXPORT_FORMATS:
+            raise HttpError(400, "format must be one of: " + ", ".join(EXPORT_FORMATS))
+        fields = parse_fields(params.fields) or LISTABLE_FIELDS
+        qs = (await sync_to_async(filter_jobs)(Job.objects.all(), params)).order_by(*job_ordering(params))
+        # The rows are read after the view returns, outside reads_from_replica,
+        # so pin the queryset to the database chosen now
+        return export_response(request, qs.using(qs.db), fields, params.format)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to export jobs: " + str(e))
+
+# Change feed for search indexes and mirrors: the creates, updates and deletes
+# after `cursor` (or `since`), oldest first, so a sync costs O(changes). With
+# stream=true (or Accept: text/event-stream) they are pushed as server-sent events.
+# Reads stay on the primary: a lagging replica could surface changes behind a
+# cursor that already moved past them.
+@router.get("/jobs/changes", response=JobChangesResponse)
+async def job_changes(request, params: JobChangesParams = Query(...)):
+    try:
+        limit = min(max(params.limit, 1), MAX_CHANGES_LIMIT)
+        position = resolve_position(request.headers.get("Last-Event-ID") or params.cursor, params.since)
+
+        if params.stream or "text/event-stream" in request.headers.get("Accept", ""):
+            if not isinstance(request, ASGIRequest):
+                raise HttpError(400, "Streaming the change feed needs the ASGI server")
+            response = StreamingHttpResponse(stream_changes(position, limit), content_type="text/event-stream")
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"  # keep proxies from buffering events
+            return response
+
+        changes, has_more = await fetch_changes(position, limit)
+        if changes:
+            next_cursor = changes[-1]["cursor"]
+        else:
+            next_cursor = encode_change_cursor(*position) if position else None
+        return {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to fetch job changes: " + str(e))
+
+# A live job, or failing that an archived one (see jobs.archive)
+async def find_job(job_id: int):
+    job = await Job.objects.defer("search_vector").filter(id=job_id).afirst()
+    if job is None:
+        job = await JobArchive.objects.filter(id=job_id).afirst()
+    if job is None:
+        raise HttpError(404, "Not Found")
+    return job
+
+# Get a single job by ID (replica reads when configured and uncached), revalidated with If-None-Match / If-Modified-Since.
+# Archived jobs are still served here, read-only.
 @router.get("/jobs/{job_id}", response=JobSchema)
-def get_job(request, job_id: int):
+@decorate_view(reads_from_replica)
+@decorate_view(conditional(job_validators))
+async def get_job(request, job_id: int):
     try:
-        return get_object_or_404(Job, id=job_id)
+        return await acached_response(
+            await adetail_cache_key(job_id), "detail", JobSchema, lambda: find_job(job_id)
+        )
+    except HttpError:
+        raise
     except Exception as e:
         raise ValidationError("Failed to fetch job: " + str(e))
 
+# Top-K live jobs most similar to a job (live or archived) by required skills,
+# title words and location. Candidates come from the precomputed MinHash/LSH
+# buckets (see jobs.similarity), so a lookup never compares against every job.
+@router.get("/jobs/{job_id}/similar", response=JobSimilarResponse)
+@decorate_view(reads_from_replica)
+async def get_similar_jobs(request, job_id: int, params: JobSimilarParams = Query(...)):
+    try:
+        async def build():
+            job = await find_job(job_id)
+            return await sync_to_async(similar_jobs)(job, SUMMARY_FIELDS, params.limit, params.status)
+
+        return await acached_response(f"{await alist_cache_key(params, 'similar')}:{job_id}", "list", None, build)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to fetch similar jobs: " + str(e))
+
 # Update an existing job
 @router.put("/jobs/{job_id}", response=JobSchema)
-def update_job(request, job_id: int, payload: JobCreateSchema):
+async def update_job(request, job_id: int, payload: JobCreateSchema):
     try:
-        job = get_object_or_404(Job, id=job_id)
+        job = await aget_object_or_404(Job, id=job_id)
         update_data = payload.dict()
         update_data.pop("company", None)  # prevent company name updates
         for key, value in update_data.items():
             setattr(job, key, value)
-        job.save()
+        await job.asave()
         return job
     except IntegrityError as e:
         raise ValidationError("Invalid job data: " + str(e))
     except Exception as e:
         raise ValidationError("Failed to update job: " + str(e))
 
+# Partially update a job: one UPDATE of the supplied columns only, recomputing
+# status when a date changes. With If-Match (the job's ETag) or `updated_at` the
+# UPDATE applies only to that version of the row, so concurrent edits cannot
+# silently overwrite each other: a stale version gets 412 Precondition Failed.
+@router.patch("/jobs/{job_id}", response=JobSchema)
+async def patch_job(request, job_id: int, payload: JobPatchSchema):
+    try:
+        values = payload.dict(exclude_none=True)
+        expected = values.pop("updated_at", None)
+        if request.headers.get("If-Match"):
+            expected = parse_if_match(request.headers["If-Match"], job_id)
+
+        qs = Job.objects.filter(id=job_id)
+        if expected is not None:
+            qs = qs.filter(updated_at=expected)
+        if values:
+            dates = {}
+            for name in ("posting_date", "expiration_date"):
+                if name in values:
+                    values[name] = dates[name] = to_date(values[name])
+            if dates:
+                values["status"] = status_expression(
+                    models.Value(dates["posting_date"]) if "posting_date" in dates else "posting_date",
+                    models.Value(dates["expiration_date"]) if "expiration_date" in dates else "expiration_date",
+                )
+            if "salary_range" in values:
+                values["salary_min"], values["salary_max"], values["currency"] = parse_salary_range(values["salary_range"])
+            if "location" in values:
+                values["location_ref_id"] = (await Location.objects.aget_or_create(name=values.pop("location")))[0].id
+            found = await qs.aupdate(**values, updated_at=timezone.now())
+        else:
+            found = await qs.aexists()  # nothing to write, but the precondition still applies
+
+        if not found:
+            if expected is not None and await Job.objects.filter(id=job_id).aexists():
+                raise HttpError(412, "Job was modified since it was read")
+            raise HttpError(404, "Not Found")
+        if values:
+            await sync_to_async(invalidate_job)(job_id)  # no post_save for UPDATE
+        return await Job.objects.defer("search_vector").aget(id=job_id)
+    except HttpError:
+        raise
+    except IntegrityError as e:
+        raise ValidationError("Invalid job data: " + str(e))
+    except Exception as e:
+        raise ValidationError("Failed to update job: " + str(e))
+
 # Delete a job
 @router.delete("/jobs/{job_id}")
-def delete_job(request, job_id: int):
+async def delete_job(request, job_id: int):
     try:
-        job = get_object_or_404(Job, id=job_id)
-        job.delete()
+        job = await aget_object_or_404(Job, id=job_id)
+        await job.adelete()
         return {"success": True}
     except Exception as e:
-        raise ValidationError("Failed to delete job: " + str(e)) 
\ No newline at end of file
+        raise ValidationError("Failed to delete job: " + str(e)) 
+
+# JobQueryParams fields that narrow a bulk selection
+BULK_FILTER_FIELDS = (
+    "search", "status", "location", "company", "location_id", "company_id", "salary_min", "salary_max",
+    "currency", "skills_any", "skills_all",
+)
+
+# Resolve a bulk selector to a queryset. A selector without ids or any filter
+# would touch every job, so it is refused rather than taken to mean "all".
+def select_jobs(selector: JobBulkSelector):
+    qs = Job.objects.all()
+    selected = False
+    if selector.ids is not None:
+        if not selector.ids:
+            raise HttpError(400, "ids must not be empty")
+        qs = qs.filter(id__in=selector.ids)
+        selected = True
+    filters = selector.filters
+    if filters is not None and any(getattr(filters, name) not in (None, "", []) for name in BULK_FILTER_FIELDS):
+        qs = filter_jobs(qs, filters)
+        selected = True
+    if not selected:
+        raise HttpError(400, "Select the jobs by ids and/or filters")
+    return qs
+
+# Apply `changes` to every job of `qs` in a single UPDATE. Salary columns are
+# parsed once from the new salary_range and status is recomputed in SQL from the
+# new (or current) dates; the search_vector trigger refreshes the text index.
+def update_selected_jobs(qs, changes: JobBulkChanges) -> int:
+    values = changes.dict(exclude_none=True)
+    expire = values.pop("expire", False)
+    today = date.today()
+    posting_date = models.Value(values["posting_date"]) if "posting_date" in values else models.F("posting_date")
+    expiration_date = models.Value(values["expiration_date"]) if "expiration_date" in values else models.F("expiration_date")
+    if expire:
+        expiration_date = Least(expiration_date, models.Value(today - timedelta(days=1)))
+        values["expiration_date"] = expiration_date
+    if not values:
+        raise HttpError(400, "No changes given")
+    if "salary_range" in values:
+        values["salary_min"], values["salary_max"], values["currency"] = parse_salary_range(values["salary_range"])
+    if "location" in values:
+        values["location_ref_id"] = Location.objects.get_or_create(name=values.pop("location"))[0].id
+    return qs.update(
+        **values,
+        status=status_expression(posting_date, expiration_date, today),
+        updated_at=timezone.now(),
+    )
+
+# Delete every job of `qs` with a single DELETE ... WHERE id IN (<selection>).
+# QuerySet.delete() would load the rows to send post_delete one by one.
+def delete_selected_jobs(qs) -> int:
+    sql, params = qs.values("id").query.sql_with_params()
+    with connections[db_router.db_for_write(Job)].cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{Job._meta.db_table}" WHERE id IN ({sql})', params)
+        return cursor.rowcount
+
+# Update many jobs with one set-based UPDATE, e.g. to expire a company's postings
+@router.post("/jobs/bulk/update", response=BulkUpdateResponse)
+def bulk_update_jobs(request, payload: JobBulkUpdateSchema):
+    try:
+        updated = update_selected_jobs(select_jobs(payload), payload.changes)
+        if updated:
+            invalidate_all()
+        return {"updated": updated}
+    except HttpError:
+        raise
+    except IntegrityError as e:
+        raise ValidationError("Invalid job data: " + str(e))
+    except Exception as e:
+        raise ValidationError("Failed to update jobs: " + str(e))
+
+# Delete many jobs with one set-based DELETE
+@router.post("/jobs/bulk/delete", response=BulkDeleteResponse)
+def bulk_delete_jobs(request, payload: JobBulkSelector):
+    try:
+        deleted = delete_selected_jobs(select_jobs(payload))
+        if deleted:
+            invalidate_all()
+        return {"deleted": deleted}
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to delete jobs: " + str(e))
+
+# Lookup endpoints for the normalized company and location names: an exact name
+# match (unique index) and a case-insensitive prefix autocomplete served by the
+# UPPER(name) text_pattern_ops indexes. The ids feed the company_id/location_id
+# filters of the listings.
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+def find_names(model, params: LookupNameParams):
+    return list(model.objects.filter(name=params.name).values("id", "name"))
+
+def autocomplete_names(model, params: LookupAutocompleteParams):
+    prefix = params.prefix.strip()
+    if not prefix:
+        raise HttpError(400, "prefix must not be empty")
+    limit = min(max(params.limit, 1), MAX_AUTOCOMPLETE_LIMIT)
+    return list(model.objects.filter(name__istartswith=prefix).order_by("name").values("id", "name")[:limit])
+
+@router.get("/companies", response=List[LookupNameSchema])
+@decorate_view(reads_from_replica)
+def find_companies(request, params: LookupNameParams = Query(...)):
+    try:
+        return find_names(Company, params)
+    except Exception as e:
+        raise ValidationError("Failed to fetch companies: " + str(e))
+
+@router.get("/companies/autocomplete", response=List[LookupNameSchema])
+@decorate_view(reads_from_replica)
+def autocomplete_companies(request, params: LookupAutocompleteParams = Query(...)):
+    try:
+        return autocomplete_names(Company, params)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to fetch companies: " + str(e))
+
+@router.get("/locations", response=List[LookupNameSchema])
+@decorate_view(reads_from_replica)
+def find_locations(request, params: LookupNameParams = Query(...)):
+    try:
+        return find_names(Location, params)
+    except Exception as e:
+        raise ValidationError("Failed to fetch locations: " + str(e))
+
+@router.get("/locations/autocomplete", response=List[LookupNameSchema])
+@decorate_view(reads_from_replica)
+def autocomplete_locations(request, params: LookupAutocompleteParams = Query(...)):
+    try:
+        return autocomplete_names(Location, params)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise ValidationError("Failed to fetch locations: " + str(e))
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        # Register the custom lookups used by the search query builder
+        from . import lookups  # noqa: F401
+        # Connect the cache invalidation receivers
+        from . import signals  # noqa: F401
+        # Expose the cache and scheduler statistics on /metrics
+        from job_platform.instrumentation import register_collector
+        from .metrics import collect
+        register_collector(collect)
+
@@ -0,0 +1,67 @@
+import time
+from datetime import date, timedelta
+from django.db import connection, transaction
+from .cache import invalidate_all
+from .models import Job, JobArchive
+
+# Columns moved from jobs_job to jobs_jobarchive: all shared fields (search_vector
+# and its indexes stay behind, archived jobs are only fetched by id)
+ARCHIVE_COLUMNS = [field.column for field in JobArchive._meta.concrete_fields if field.name != "archived_at"]
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+# Jobs are archived once they expired more than `days` days ago
+def archive_cutoff(days: int, today: date = None) -> date:
+    return (today or date.today()) - timedelta(days=days)
+
+
+# Move up to `batch_size` jobs that expired before `cutoff` into the archive, oldest
+# first, with one statement: DELETE ... RETURNING feeds the INSERT, so a batch is
+# all or nothing and an interrupted run resumes by just running again. SKIP LOCKED
+# leaves rows being edited for a later batch instead of waiting on them.
+def archive_batch(cutoff: date, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    columns = ", ".join(f'"{column}"' for column in ARCHIVE_COLUMNS)
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Flags the tombstones written by the delete trigger as archived
+        cursor.execute("SET LOCAL jobs.archiving = 'on'")
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{Job._meta.db_table}" WHERE id IN (
+                    SELECT id FROM "{Job._meta.db_table}"
+                    WHERE expiration_date < %s
+                    ORDER BY expiration_date, id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {columns}
+            )
+            INSERT INTO "{JobArchive._meta.db_table}" ({columns}, archived_at)
+            SELECT {columns}, now() FROM moved
+            """,
+            [cutoff, batch_size],
+        )
+        return cursor.rowcount
+
+
+# Archive every job that expired before `cutoff`, batch by batch, calling
+# `progress` with the running total. `max_batches` bounds one run and `pause`
+# (seconds) throttles the write load between batches.
+def archive_jobs(cutoff: date, batch_size: int = ARCHIVE_BATCH_SIZE, max_batches: int = 0,
+                 pause: float = 0, progress=None) -> int:
+    moved = 0
+    batches = 0
+    while not max_batches or batches < max_batches:
+        count = archive_batch(cutoff, batch_size)
+        batches += 1
+        if count:
+            moved += count
+            invalidate_all()
+            if progress:
+                progress(moved)
+        if count < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return moved
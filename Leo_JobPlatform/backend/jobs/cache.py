@@ -0,0 +1,183 @@
+import hashlib
+import json
+import threading
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from job_platform.db_router import read_primary
+from job_platform.renderers import dumps
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+# Listing and detail keys embed a generation number. Any write bumps the listing
+# generation (a new job can land on any page), while a detail entry is deleted
+# by id; transitions touching many rows bump the detail generation as well.
+LIST_VERSION_KEY = "jobs:list:version"
+DETAIL_VERSION_KEY = "jobs:detail:version"
+
+# Hit/miss counters since process start
+counters = {"list_hits": 0, "list_misses": 0, "detail_hits": 0, "detail_misses": 0}
+_counters_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return settings.JOBS_CACHE_TIMEOUT > 0
+
+
+def _count(name: str):
+    with _counters_lock:
+        counters[name] += 1
+
+
+def _version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+# Async counterpart of _version, so async views never block the event loop on a
+# network or file cache backend
+async def _aversion(key: str) -> int:
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, 1, timeout=None)
+        version = await cache.aget(key, 1)
+    return version
+
+
+def _bump(key: str):
+    try:
+        cache.incr(key)
+    except ValueError:  # evicted or never set
+        cache.add(key, 1, timeout=None)
+
+
+# Digest of the normalized JobQueryParams, so equivalent queries
+# (e.g. "Active" vs "active", default vs explicit page) share an entry
+def params_digest(params) -> str:
+    data = params.dict()
+    for name, value in data.items():
+        if isinstance(value, str):
+            data[name] = value.strip()
+        elif isinstance(value, list):
+            data[name] = sorted(value)
+    if data.get("status"):
+        data["status"] = data["status"].lower()
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# Cache key of a listing-style response (`namespace` separates endpoints)
+def list_cache_key(params, namespace: str = "list") -> str:
+    return f"jobs:{namespace}:{_version(LIST_VERSION_KEY)}:{params_digest(params)}"
+
+
+def detail_cache_key(job_id: int) -> str:
+    return f"jobs:detail:{_version(DETAIL_VERSION_KEY)}:{job_id}"
+
+
+async def alist_cache_key(params, namespace: str = "list") -> str:
+    return f"jobs:{namespace}:{await _aversion(LIST_VERSION_KEY)}:{params_digest(params)}"
+
+
+async def adetail_cache_key(job_id: int) -> str:
+    return f"jobs:detail:{await _aversion(DETAIL_VERSION_KEY)}:{job_id}"
+
+
+# Serialize a response exactly like the API renderer would. Without a schema
+# the data is taken to be plain JSON-ready values and encoded directly.
+def render(schema, data) -> bytes:
+    if schema is not None:
+        data = schema.from_orm(data).model_dump()
+    return dumps(data)
+
+
+# Return the pre-serialized JSON for `key`, building and storing it on a miss.
+# `kind` ("list" or "detail") selects the hit/miss counters.
+# Entries are built from the primary even in replica-reading views: a replica
+# behind a write would otherwise store the old rows under the generation that
+# write just bumped, and serve them (and 304s for their ETag) until the next
+# write. Without the cache, builds read wherever the view reads.
+def cached_response(key: str, kind: str, schema, build) -> HttpResponse:
+    if not cache_enabled():
+        _count(f"{kind}_misses")
+        return HttpResponse(render(schema, build()), content_type=JSON_CONTENT_TYPE)
+    body = cache.get(key)
+    if body is None:
+        _count(f"{kind}_misses")
+        with read_primary():
+            body = render(schema, build())
+        cache.set(key, body, settings.JOBS_CACHE_TIMEOUT)
+    else:
+        _count(f"{kind}_hits")
+    return HttpResponse(body, content_type=JSON_CONTENT_TYPE)
+
+
+# Async counterpart of cached_response for async endpoints; `build` is a coroutine function
+async def acached_response(key: str, kind: str, schema, build) -> HttpResponse:
+    if not cache_enabled():
+        _count(f"{kind}_misses")
+        return HttpResponse(render(schema, await build()), content_type=JSON_CONTENT_TYPE)
+    body = await cache.aget(key)
+    if body is None:
+        _count(f"{kind}_misses")
+        with read_primary():
+            body = render(schema, await build())
+        await cache.aset(key, body, settings.JOBS_CACHE_TIMEOUT)
+    else:
+        _count(f"{kind}_hits")
+    return HttpResponse(body, content_type=JSON_CONTENT_TYPE)
+
+
+# Memoize a small derived value (e.g. conditional request validators) under a
+# response cache key, so it is invalidated together with that response. Built
+# from the primary, like the responses it describes.
+# `timeout` overrides JOBS_CACHE_TIMEOUT for values that should expire sooner.
+def cached_value(key: str, build, timeout: int = None):
+    if not cache_enabled():
+        return build()
+    value = cache.get(key)
+    if value is None:
+        with read_primary():
+            value = build()
+        cache.set(key, value, settings.JOBS_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
+
+
+async def acached_value(key: str, build, timeout: int = None):
+    if not cache_enabled():
+        return await build()
+    value = await cache.aget(key)
+    if value is None:
+        with read_primary():
+            value = await build()
+        await cache.aset(key, value, settings.JOBS_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
+
+
+# Invalidation runs immediately and again after commit, so a request that
+# re-cached the old rows while the write transaction was open is evicted too
+def _invalidate(func):
+    func()
+    transaction.on_commit(func)
+
+
+def invalidate_job(job_id: int):
+    def run():
+        key = detail_cache_key(job_id)
+        cache.delete_many([key, f"{key}:validators"])
+        _bump(LIST_VERSION_KEY)
+    _invalidate(run)
+
+
+def invalidate_listings():
+    _invalidate(lambda: _bump(LIST_VERSION_KEY))
+
+
+def invalidate_all():
+    def run():
+        _bump(LIST_VERSION_KEY)
+        _bump(DETAIL_VERSION_KEY)
+    _invalidate(run)
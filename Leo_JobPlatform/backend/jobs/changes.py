@@ -0,0 +1,171 @@
+import asyncio
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, models
+from django.utils import timezone
+from ninja.errors import HttpError
+from job_platform.renderers import dumps
+from .models import Job, JobTombstone
+from .schemas import JobSchema
+
+# Change feed: jobs and tombstones ordered by their change position, (change_xid,
+# change_seq, id) as stamped by triggers on every write, read after a cursor holding
+# the last position a consumer has seen. Both orders are served by keyset scans of
+# their indexes, so a sync costs O(changes) rather than O(table).
+#
+# A transaction may commit long after it stamped its rows, so positions are only
+# served once no transaction that could still commit below them is running: the
+# writing transaction must be older than the snapshot's xmin, the oldest one still
+# in progress. Later commits then always land after every served position. A long
+# transaction holds the feed back until it ends.
+
+MAX_CHANGES_LIMIT = 1000
+
+
+def encode_change_cursor(xid, seq, pk, changed_at: datetime) -> str:
+    raw = json.dumps({"x": xid, "s": seq, "id": pk, "t": changed_at.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        changed_at = datetime.fromisoformat(data["t"])
+        if "x" not in data:
+            # Issued before the feed was ordered by change positions
+            raise HttpError(410, "Cursor is no longer valid; resync from /api/jobs/export")
+        if data["x"] is None:  # a `since` start time with nothing after it yet
+            position = (None, None, None, changed_at)
+        else:
+            position = (int(data["x"]), int(data["s"]), int(data["id"]), changed_at)
+    except (ValueError, TypeError, KeyError):
+        raise HttpError(400, "Invalid cursor")
+    if changed_at.tzinfo is None:
+        raise HttpError(400, "Invalid cursor")
+    return position
+
+
+# Starting position of a feed request: a cursor, a start time (`since`, as
+# (None, None, None, since)) or the beginning of time. Positions older than the
+# tombstone retention would silently miss deletes, so the consumer must resync
+# from a full export.
+def resolve_position(cursor: str = None, since: datetime = None):
+    if cursor:
+        position = decode_change_cursor(cursor)
+    elif since:
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        position = (None, None, None, since)
+    else:
+        return None
+    horizon = timezone.now() - timedelta(days=settings.JOBS_TOMBSTONE_RETENTION_DAYS)
+    if position[3] < horizon:
+        raise HttpError(410, "Cursor is older than the change history; resync from /api/jobs/export")
+    return position
+
+
+# Rows of `qs` after `position` in (change_xid, change_seq, pk) order, or changed at
+# or after a `since` start time (`time_field`). The redundant `change_xid >= xid`
+# bound lets PostgreSQL use it as an index range condition.
+def after(qs, pk: str, time_field: str, position):
+    if position is None:
+        return qs
+    xid, seq, last_pk, changed_at = position
+    if xid is None:
+        return qs.filter(**{f"{time_field}__gte": changed_at})
+    return qs.filter(
+        models.Q(change_xid__gte=xid),
+        models.Q(change_xid__gt=xid)
+        | models.Q(change_xid=xid, change_seq__gt=seq)
+        | models.Q(change_xid=xid, change_seq=seq, **{f"{pk}__gt": last_pk}),
+    )
+
+
+# Condition on change_xid selecting the writes whose transaction can no longer
+# commit behind a served position: older than the snapshot's xmin, or written by
+# the current transaction itself. Taken once per fetch, for jobs and tombstones alike.
+def settled_condition() -> models.Q:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint, "
+            "pg_current_xact_id_if_assigned()::text::bigint"
+        )
+        xmin, own = cursor.fetchone()
+    condition = models.Q(change_xid__lt=xmin)
+    if own is not None:
+        condition |= models.Q(change_xid=own)
+    return condition
+
+
+def change_entry(op: str, xid: int, seq: int, pk: int, changed_at: datetime, job=None) -> dict:
+    return {
+        "op": op,
+        "id": pk,
+        "changed_at": changed_at,
+        "job": job,
+        "cursor": encode_change_cursor(xid, seq, pk, changed_at),
+    }
+
+
+# Up to `limit` settled changes after `position`, oldest first, and whether more
+# are waiting. A job created after `position` is reported as a "create", any
+# later write to an existing job as an "update"; jobs leaving jobs_job are a
+# "delete", or an "archive" when moved to the archive (still served by get_job).
+async def fetch_changes(position, limit: int):
+    settled = await sync_to_async(settled_condition)()
+    jobs = after(Job.objects.defer("search_vector").filter(settled), "id", "updated_at", position)
+    tombstones = after(JobTombstone.objects.filter(settled), "job_id", "deleted_at", position)
+
+    changes = [
+        ((job.change_xid, job.change_seq, job.id), change_entry(
+            "create" if position is None or job.created_at > position[3] else "update",
+            job.change_xid, job.change_seq, job.id, job.updated_at, job,
+        ))
+        async for job in jobs.order_by("change_xid", "change_seq", "id")[:limit + 1]
+    ]
+    changes += [
+        ((tombstone.change_xid, tombstone.change_seq, tombstone.job_id), change_entry(
+            "archive" if tombstone.archived else "delete",
+            tombstone.change_xid, tombstone.change_seq, tombstone.job_id, tombstone.deleted_at,
+        ))
+        async for tombstone in tombstones.order_by("change_xid", "change_seq", "job_id")[:limit + 1]
+    ]
+    changes.sort(key=lambda change: change[0])
+    return [entry for _, entry in changes[:limit]], len(changes) > limit
+
+
+# Server-sent events: every change as an event whose id is its cursor (so
+# EventSource reconnects resume from Last-Event-ID), polling for new changes
+# every JOBS_CHANGES_POLL_SECONDS with keepalive comments in between. The stream
+# ends after JOBS_CHANGES_STREAM_SECONDS; clients reconnect and carry on.
+async def stream_changes(position, limit: int):
+    deadline = time.monotonic() + settings.JOBS_CHANGES_STREAM_SECONDS
+    yield f"retry: {int(settings.JOBS_CHANGES_POLL_SECONDS * 1000)}\n\n".encode()
+    while True:
+        changes, has_more = await fetch_changes(position, limit)
+        for change in changes:
+            data = {**change, "job": JobSchema.from_orm(change["job"]).model_dump() if change["job"] else None}
+            yield b"id: %s\nevent: %s\ndata: %s\n\n" % (change["cursor"].encode(), change["op"].encode(), dumps(data))
+        if changes:
+            position = decode_change_cursor(changes[-1]["cursor"])
+        if time.monotonic() >= deadline:
+            return
+        if not has_more:
+            if not changes:
+                yield b": keepalive\n\n"
+            if settings.DB_POOL:
+                # Hand the connection back to the pool while idle
+                await sync_to_async(connection.close)()
+            await asyncio.sleep(settings.JOBS_CHANGES_POLL_SECONDS)
+
+
+# Delete the tombstones past their retention; returns the number removed
+def prune_tombstones() -> int:
+    horizon = timezone.now() - timedelta(days=settings.JOBS_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = JobTombstone.objects.filter(deleted_at__lt=horizon).delete()
+    return deleted
@@ -0,0 +1,78 @@
+from django.db import connections
+from ninja.errors import HttpError
+from .models import LOOKUP_FIELDS
+
+# Facet name -> grouped column of the filtered rows; skills are counted per array element
+FACET_COLUMNS = {
+    "status": "status",
+    "company": "company",
+    "location": "location",
+    "skills": None,
+}
+# Facets grouped by key, with the names joined in from the lookup table afterwards
+FACET_LOOKUPS = {name: model._meta.db_table for name, model in LOOKUP_FIELDS.items()}
+# Values returned per facet, most frequent first
+FACET_LIMIT = 20
+
+
+# Resolve the `facets` parameter: "true"/"all" selects every facet,
+# otherwise a comma-separated list of facet names
+def parse_facets(value):
+    if not value:
+        return []
+    value = value.strip().lower()
+    if value in ("true", "all", "1"):
+        return list(FACET_COLUMNS)
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = sorted(set(names) - set(FACET_COLUMNS))
+    if unknown:
+        raise HttpError(400, "Unknown facets: " + ", ".join(unknown))
+    return names
+
+
+# Count the values of every requested facet over the filtered queryset in a single
+# round trip: the filtered rows are materialized once as a CTE and each facet is a
+# GROUP BY over it, combined with UNION ALL and trimmed to the top FACET_LIMIT values.
+def compute_facets(qs, names, limit: int = FACET_LIMIT):
+    if not names:
+        return {}
+    sql, params = qs.order_by().values(
+        "status", "company_ref_id", "location_ref_id", "required_skills"
+    ).query.sql_with_params()
+
+    parts = []
+    for name in names:
+        column = FACET_COLUMNS[name]
+        if column is None:
+            parts.append(
+                f"SELECT '{name}' AS facet, skill AS value, count(*) AS count "
+                f"FROM filtered, unnest(required_skills) AS skill GROUP BY skill"
+            )
+        elif name in FACET_LOOKUPS:
+            parts.append(
+                f"SELECT '{name}' AS facet, lookup.name::text AS value, count(*) AS count "
+                f"FROM filtered JOIN {FACET_LOOKUPS[name]} AS lookup ON lookup.id = filtered.{column} "
+                f"GROUP BY lookup.id"
+            )
+        else:
+            parts.append(
+                f"SELECT '{name}' AS facet, {column}::text AS value, count(*) AS count "
+                f"FROM filtered GROUP BY {column}"
+            )
+    query = f"""
+        WITH filtered (status, company, location, required_skills) AS MATERIALIZED ({sql})
+        SELECT facet, value, count FROM (
+            SELECT facet, value, count,
+                   row_number() OVER (PARTITION BY facet ORDER BY count DESC, value) AS position
+            FROM ({" UNION ALL ".join(parts)}) AS counts
+        ) AS ranked
+        WHERE position <= %s
+        ORDER BY facet, position
+    """
+
+    facets = {name: [] for name in names}
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(query, (*params, limit))
+        for facet, value, count in cursor.fetchall():
+            facets[facet].append({"value": value, "count": count})
+    return facets
@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import islice
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from pydantic import ValidationError as SchemaValidationError
+from .cache import invalidate_listings
+from .models import Job, compute_status, resolve_lookups, to_date
+from .salary import parse_salary_range
+from .schemas import JobCreateSchema
+
+# Rows written per COPY/INSERT statement
+BULK_BATCH_SIZE = 5000
+
+# Columns written by the COPY fast path; search_vector is filled in by its trigger
+COPY_COLUMNS = [
+    "title", "description", "location_id", "salary_range", "salary_min", "salary_max", "currency",
+    "company_id", "required_skills", "posting_date", "expiration_date", "status", "created_at", "updated_at",
+]
+# Model attribute holding each column's value
+COPY_ATTRIBUTES = {field.column: field.attname for field in Job._meta.concrete_fields}
+# Nullable non-text columns; their empty values are read back as NULL
+COPY_NULLABLE_COLUMNS = ["salary_min", "salary_max"]
+
+
+# Parse an NDJSON body line by line so the upload is never held in memory at once.
+# Lines that are not valid JSON are yielded as the exception and reported per row.
+def iter_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+# Validate a raw row with JobCreateSchema and build the unsaved Job,
+# precomputing the same status and salary columns Job.save would assign
+def build_job(row, today: date) -> Job:
+    if isinstance(row, Exception):
+        raise row
+    data = JobCreateSchema.model_validate(row).dict()
+    data["posting_date"] = to_date(data["posting_date"])
+    data["expiration_date"] = to_date(data["expiration_date"])
+    data["salary_range"] = data["salary_range"] or ""
+    data["status"] = compute_status(data["posting_date"], data["expiration_date"], today)
+    data["salary_min"], data["salary_max"], data["currency"] = parse_salary_range(data["salary_range"])
+    return Job(**data)
+
+
+def format_error(error: Exception) -> str:
+    if isinstance(error, SchemaValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+# PostgreSQL array literal for a text[] column in COPY CSV input
+def pg_array(values) -> str:
+    items = ('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(items) + "}"
+
+
+# Stream a batch into jobs_job with COPY, skipping per-row INSERT compilation
+def copy_batch(jobs):
+    now = timezone.now()
+    buffer = io.StringIO()
+    # Quote every string so empty strings aren't read back as NULL (None is
+    # written as a quoted empty string too, hence FORCE_NULL below)
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for job in jobs:
+        job.created_at = job.updated_at = now
+        writer.writerow([
+            pg_array(value) if name == "required_skills" else value
+            for name, value in ((name, getattr(job, COPY_ATTRIBUTES[name])) for name in COPY_COLUMNS)
+        ])
+    buffer.seek(0)
+
+    sql = (
+        f"COPY {Job._meta.db_table} ({', '.join(COPY_COLUMNS)}) FROM STDIN "
+        f"WITH (FORMAT csv, FORCE_NULL ({', '.join(COPY_NULLABLE_COLUMNS)}))"
+    )
+    with connection.cursor() as cursor, connection.wrap_database_errors:
+        if hasattr(cursor.cursor, "copy_expert"):  # psycopg2
+            cursor.cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+# Write a batch with a single COPY (or multi-row INSERT on other backends), after
+# resolving its company and location names to keys. If the database rejects it,
+# split the batch in halves and retry, so a bad row costs O(log n) extra
+# statements and never aborts its neighbours.
+def write_batch(batch, errors) -> int:
+    try:
+        with transaction.atomic():
+            resolve_lookups([job for _, job in batch])
+            if connection.vendor == "postgresql":
+                copy_batch([job for _, job in batch])
+            else:
+                Job.objects.bulk_create([job for _, job in batch])
+        return len(batch)
+    except DatabaseError as e:
+        if len(batch) == 1:
+            errors.append({"row": batch[0][0], "error": str(e).strip()})
+            return 0
+
+    middle = len(batch) // 2
+    return write_batch(batch[:middle], errors) + write_batch(batch[middle:], errors)
+
+
+# Ingest an iterable of raw job rows in batches of `batch_size`.
+# Returns the number of created jobs and the per-row errors (by 0-based row index).
+def ingest_jobs(rows, batch_size: int = BULK_BATCH_SIZE):
+    today = date.today()
+    created = 0
+    errors = []
+    rows = enumerate(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        batch = []
+        for index, row in chunk:
+            try:
+                batch.append((index, build_job(row, today)))
+            except (SchemaValidationError, ValueError, TypeError) as e:
+                errors.append({"row": index, "error": format_error(e)})
+        if batch:
+            created += write_batch(batch, errors)
+    errors.sort(key=lambda error: error["row"])
+    # COPY bypasses the model signals
+    if created:
+        invalidate_listings()
+    return created, errors
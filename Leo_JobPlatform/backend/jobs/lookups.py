@@ -0,0 +1,17 @@
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains
+
+
+# Django compiles `icontains` on PostgreSQL to `UPPER(col::text) LIKE UPPER(%s)`,
+# which no plain column index can serve. `ILIKE` on the bare column is matched by
+# the pg_trgm GIN indexes (gin_trgm_ops) declared on Job, so substring search
+# turns into a bitmap index scan instead of a sequential scan of jobs_job.
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramIContains(IContains):
+    lookup_name = "trgm_icontains"
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from jobs.archive import ARCHIVE_BATCH_SIZE, archive_cutoff, archive_jobs
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = ('Move jobs that expired long ago from jobs_job to the archive table in batches, '
+            'keeping the serving table small; safe to stop and rerun at any point')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.JOBS_ARCHIVE_AFTER_DAYS,
+                            help='Archive jobs that expired more than this many days ago '
+                                 f'(default: JOBS_ARCHIVE_AFTER_DAYS, {settings.JOBS_ARCHIVE_AFTER_DAYS})')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE,
+                            help=f'Jobs moved per transaction (default: {ARCHIVE_BATCH_SIZE})')
+        parser.add_argument('--max-batches', type=int, default=0,
+                            help='Stop after this many batches (default: until done)')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to wait between batches, to throttle the write load')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='VACUUM ANALYZE jobs_job afterwards, so the freed space is reused '
+                                 'and the planner sees the smaller table')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] <= 0:
+            raise CommandError('--days must not be negative and --batch-size must be positive')
+        cutoff = archive_cutoff(options['days'])
+        self.stdout.write(f'Archiving jobs that expired before {cutoff}')
+
+        moved = archive_jobs(
+            cutoff, batch_size=options['batch_size'], max_batches=options['max_batches'],
+            pause=options['pause'], progress=lambda total: self.stdout.write(f'Archived {total} jobs'),
+        )
+        if moved and options['vacuum']:
+            with connection.cursor() as cursor:
+                cursor.execute(f'VACUUM (ANALYZE) "{Job._meta.db_table}"')
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} jobs'))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.cache import invalidate_all
+from jobs.models import Job
+from jobs.salary import parse_salary_range
+
+
+class Command(BaseCommand):
+    help = 'Parse salary_range into salary_min/salary_max/currency for existing jobs, in id-ordered batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows read and updated per transaction (default: 1000)')
+        parser.add_argument('--all', action='store_true',
+                            help='Re-parse every job, not only those without parsed bounds')
+
+    def handle(self, *args, **options):
+        qs = Job.objects.exclude(salary_range="")
+        if not options['all']:
+            qs = qs.filter(salary_min__isnull=True)
+
+        # Keyset over the primary key: every batch is an index range scan and a
+        # short transaction, so the command can be stopped and rerun at any point
+        last_id = 0
+        scanned = updated = 0
+        while True:
+            batch = list(
+                qs.filter(id__gt=last_id).order_by('id')
+                .only('id', 'salary_range', 'salary_min', 'salary_max', 'currency')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            changed = []
+            for job in batch:
+                parsed = parse_salary_range(job.salary_range)
+                if parsed != (job.salary_min, job.salary_max, job.currency):
+                    job.salary_min, job.salary_max, job.currency = parsed
+                    changed.append(job)
+            if changed:
+                with transaction.atomic():
+                    Job.objects.bulk_update(changed, ['salary_min', 'salary_max', 'currency'])
+                updated += len(changed)
+            self.stdout.write(f'Scanned {scanned} jobs, updated {updated} (last id {last_id})')
+
+        # bulk_update bypasses the model signals
+        if updated:
+            invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f'Backfilled salaries of {updated} jobs'))
@@ -0,0 +1,216 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from jobs.models import Job
+from jobs.pagination import encode_cursor
+from jobs.testdata import analyze_jobs, load_jobs
+from datetime import date, timedelta
+import django
+import json
+import math
+import platform
+import random
+import statistics
+import time
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# Nearest-rank percentile of sorted timings
+def percentile(timings, p):
+    return timings[max(0, math.ceil(p / 100 * len(timings)) - 1)]
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the jobs API in-process: latency percentiles, throughput and '
+            'queries per request for scripted list/detail/write scenarios')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=0,
+                            help='Top the table up to this many jobs with generated data first (kept afterwards)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data and request mix')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario')
+        parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios')
+        parser.add_argument('--cache', action='store_true',
+                            help='Keep the response cache on (by default every request hits the database)')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Compare against the JSON results of an earlier run')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='Fail when a scenario p95 is this many percent slower than in --compare')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.client = Client(raise_request_exception=False)
+
+        existing = Job.objects.count()
+        if options['jobs'] > existing:
+            missing = options['jobs'] - existing
+            self.stdout.write(f'Generating {missing} jobs...')
+            started = time.perf_counter()
+            load_jobs(missing, seed=options['seed'], offset=existing)
+            analyze_jobs()
+            self.stdout.write(f'Generated {missing} jobs in {time.perf_counter() - started:.1f}s')
+        total = Job.objects.count()
+        if not total:
+            raise CommandError('No jobs to benchmark, pass --jobs N to generate some')
+
+        scenarios = self.build_scenarios(total)
+        if options['scenarios']:
+            unknown = set(options['scenarios']) - set(scenarios)
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = {name: scenarios[name] for name in scenarios if name in options['scenarios']}
+
+        settings = {} if options['cache'] else {'JOBS_CACHE_TIMEOUT': 0}
+        results = {}
+        try:
+            with override_settings(**settings):
+                for name, request in scenarios.items():
+                    results[name] = self.run_scenario(request, options['iterations'], options['warmup'])
+                    self.report(name, results[name])
+        finally:
+            # Remove what the write scenarios created and did not delete
+            Job.objects.filter(id__in=self.created_ids).delete()
+
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'jobs': total,
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'seed': options['seed'],
+                'cache': options['cache'],
+                'database': f"{connection.vendor} {getattr(connection, 'pg_version', '')}".strip(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options['compare']:
+            self.compare(results, options['compare'], options['threshold'])
+
+    # Scenario name -> callable returning (method, path, JSON body) for the next request
+    def build_scenarios(self, total):
+        sample_ids = list(Job.objects.order_by('?').values_list('id', flat=True)[:1000])
+        # A cursor half way through the default ordering, like a client deep in infinite scroll
+        middle = Job.objects.order_by('-posting_date', '-id').values('id', 'posting_date')[total // 2]
+        deep_cursor = encode_cursor('posting_date', middle['posting_date'], middle['id'])
+        deep_page = max(1, total // 10 // 2)
+        self.created_ids = []
+
+        def get(path):
+            return lambda: ('get', path, None)
+
+        def job_payload():
+            posting_date = date.today() + timedelta(days=self.rng.randint(-10, 10))
+            return {
+                'title': 'Benchmark Engineer',
+                'company': 'Benchmark Corp',
+                'location': 'Taipei, Taiwan',
+                'description': 'Created by benchmark_api',
+                'salary_range': '80,000 - 120,000 TWD',
+                'required_skills': ['Python', 'PostgreSQL'],
+                'posting_date': posting_date.isoformat(),
+                'expiration_date': (posting_date + timedelta(days=30)).isoformat(),
+            }
+
+        # A job from the create scenario, or a fresh one when it did not run
+        def created_job(remove=False):
+            if not self.created_ids:
+                response = self.client.post('/api/jobs', job_payload(), content_type='application/json')
+                self.created_ids.append(json.loads(response.content)['id'])
+            return self.created_ids.pop() if remove else self.rng.choice(self.created_ids)
+
+        return {
+            'list_default': get('/api/jobs'),
+            'list_expiration': get('/api/jobs?order_by=expiration_date'),
+            'list_deep_page': get(f'/api/jobs?page={deep_page}'),
+            'list_deep_cursor': get(f'/api/jobs?cursor={deep_cursor}'),
+            'list_search': get('/api/jobs?search=Kubernetes'),
+            'list_fulltext': get('/api/jobs?search=python+developer&search_mode=fulltext'),
+            'list_filters': get('/api/jobs?status=active&location=Taipei&company=Tech'),
+            'list_skills': get('/api/jobs?skills_all=Python,PostgreSQL'),
+            'list_salary': get('/api/jobs?order_by=salary&salary_min=100000'),
+            'list_facets': get('/api/jobs?status=active&facets=true'),
+            'list_summary': get('/api/jobs?fields=summary&page_size=100'),
+            'get_job': lambda: ('get', f'/api/jobs/{self.rng.choice(sample_ids)}', None),
+            'similar_jobs': lambda: ('get', f'/api/jobs/{self.rng.choice(sample_ids)}/similar', None),
+            'create_job': lambda: ('post', '/api/jobs', job_payload()),
+            'update_job': lambda: ('put', f'/api/jobs/{created_job()}', job_payload()),
+            'delete_job': lambda: ('delete', f'/api/jobs/{created_job(remove=True)}', None),
+        }
+
+    def run_scenario(self, request, iterations, warmup):
+        timings = []
+        queries = []
+        errors = 0
+        for i in range(warmup + iterations):
+            method, path, body = request()
+            kwargs = {} if body is None else {'data': body, 'content_type': 'application/json'}
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(self.client, method)(path, **kwargs)
+                elapsed = (time.perf_counter() - started) * 1000
+            if method == 'post' and response.status_code == 200:
+                self.created_ids.append(json.loads(response.content)['id'])
+            if i < warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(len(captured))
+            if response.status_code >= 400:
+                errors += 1
+
+        timings.sort()
+        result = {
+            'requests': len(timings),
+            'errors': errors,
+            'mean_ms': round(statistics.mean(timings), 3),
+            'max_ms': round(timings[-1], 3),
+            'throughput_rps': round(len(timings) / (sum(timings) / 1000), 1),
+            'queries_per_request': round(statistics.mean(queries), 2),
+            'max_queries': max(queries),
+        }
+        for p in PERCENTILES:
+            result[f'p{p}_ms'] = round(percentile(timings, p), 3)
+        return result
+
+    def report(self, name, result):
+        line = (
+            f"{name:18} p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+            f"p99 {result['p99_ms']:8.2f}ms  {result['throughput_rps']:8.1f} req/s  "
+            f"{result['queries_per_request']:.1f} queries/req"
+        )
+        if result['errors']:
+            line += f"  {result['errors']} errors"
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+    def compare(self, results, path, threshold):
+        with open(path) as f:
+            baseline = json.load(f)['scenarios']
+        regressions = []
+        self.stdout.write(f'Compared with {path}:')
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0
+            line = (
+                f"{name:18} p95 {before['p95_ms']:8.2f}ms -> {result['p95_ms']:8.2f}ms ({change:+.1f}%)  "
+                f"queries {before['queries_per_request']:.1f} -> {result['queries_per_request']:.1f}"
+            )
+            if change > threshold or result['queries_per_request'] > before['queries_per_request']:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"Regressions in: {', '.join(regressions)}")
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from jobs import cache as job_cache
+from jobs.models import Job
+import time
+
+
+class Command(BaseCommand):
+    help = 'Compare cold vs. warm throughput of the cached list/detail endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per run')
+
+    def handle(self, *args, **options):
+        ids = list(Job.objects.values_list('id', flat=True)[:20])
+        if not ids:
+            self.stderr.write('No jobs found, run generate_test_data first')
+            return
+        urls = [
+            '/api/jobs',
+            '/api/jobs?status=active',
+            '/api/jobs?order_by=expiration_date&page=2',
+            '/api/jobs?search=Developer',
+        ] + [f'/api/jobs/{job_id}' for job_id in ids]
+
+        client = Client()
+        total = options['requests']
+        for label, clear in (('cold', True), ('warm', False)):
+            before = dict(job_cache.counters)
+            cache.clear()
+            start = time.perf_counter()
+            for i in range(total):
+                if clear:
+                    cache.clear()
+                response = client.get(urls[i % len(urls)])
+                assert response.status_code == 200, response.content
+            elapsed = time.perf_counter() - start
+            delta = {key: job_cache.counters[key] - before[key] for key in before}
+            self.stdout.write(
+                f"{label}: {total / elapsed:.0f} req/s "
+                f"(list hits {delta['list_hits']}/misses {delta['list_misses']}, "
+                f"detail hits {delta['detail_hits']}/misses {delta['detail_misses']})"
+            )
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from urllib.parse import urlsplit
+from .benchmark_api import percentile
+import http.client
+import json
+import threading
+import time
+
+
+class Command(BaseCommand):
+    help = ('Load a running server (WSGI or ASGI) with concurrent keep-alive clients and report '
+            'throughput and latency percentiles per concurrency level')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument('--paths', nargs='+', default=['/api/jobs', '/api/jobs?search=python'],
+                            help='Request paths, used round robin')
+        parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 16, 64],
+                            help='Concurrent clients per level')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per concurrency level')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http':
+            raise CommandError('Only http:// URLs are supported')
+        self.host, self.port = url.hostname, url.port or 80
+        self.paths = options['paths']
+
+        results = {}
+        for concurrency in options['concurrency']:
+            result = self.run_level(concurrency, options['requests'])
+            results[str(concurrency)] = result
+            self.stdout.write(
+                f"{concurrency:4} clients: {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                f"p99 {result['p99_ms']:8.2f}ms  {result['errors']} errors"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'url': options['url'], 'paths': self.paths, 'levels': results}, f, indent=2)
+
+    def run_level(self, concurrency, total):
+        local = threading.local()
+        counter = iter(range(total))
+        lock = threading.Lock()
+
+        # One keep-alive connection per client thread
+        def request(i):
+            if not hasattr(local, 'conn'):
+                local.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            started = time.perf_counter()
+            try:
+                local.conn.request('GET', self.paths[i % len(self.paths)])
+                response = local.conn.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                local.conn.close()
+                del local.conn
+                ok = False
+            return (time.perf_counter() - started) * 1000, ok
+
+        def client():
+            timings = []
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return timings
+                timings.append(request(i))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = [sample for timings in pool.map(lambda _: client(), range(concurrency)) for sample in timings]
+        elapsed = time.perf_counter() - started
+
+        timings = sorted(ms for ms, _ in samples)
+        result = {
+            'requests': len(samples),
+            'errors': sum(1 for _, ok in samples if not ok),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+        }
+        for p in (50, 95, 99):
+            result[f'p{p}_ms'] = round(percentile(timings, p), 3)
+        return result
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from jobs.models import Job
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    help = 'Measure GET /api/jobs latency for a full page (response cache disabled)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        if Job.objects.count() < page_size:
+            self.stderr.write(f'Need at least {page_size} jobs, run generate_test_data first')
+            return
+
+        client = Client()
+        scenarios = {
+            'full JobSchema': f'/api/jobs?page_size={page_size}',
+            'fields=summary': f'/api/jobs?page_size={page_size}&fields=summary',
+        }
+        with override_settings(JOBS_CACHE_TIMEOUT=0):
+            for label, url in scenarios.items():
+                client.get(url)  # warm up connections and imports
+                timings = []
+                for _ in range(options['iterations']):
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200, response.content
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                self.stdout.write(
+                    f"{label}: median {statistics.median(timings):.2f}ms, p95 {p95:.2f}ms, "
+                    f"{len(response.content)} bytes"
+                )
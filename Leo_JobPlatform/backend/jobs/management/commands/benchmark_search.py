@@ -0,0 +1,107 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from jobs.apis import build_search_query
+from jobs.models import Job, resolve_lookups
+from datetime import date, timedelta
+import json
+import random
+import statistics
+import time
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the substring search used by list_jobs and show which index the plan uses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=0,
+                            help='Insert this many synthetic jobs for the run (rolled back afterwards)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the synthetic jobs, so runs can be reproduced and compared')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per search term')
+        parser.add_argument('--terms', nargs='+', default=['Kubernetes', 'Engineer 4217', 'Company 42', 'xyz-no-match'])
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['count']:
+                    self.insert_jobs(options['count'], options['seed'])
+                self.run(options['terms'], options['iterations'])
+                # Never keep the synthetic rows around
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def insert_jobs(self, count, seed):
+        rng = random.Random(seed)
+        # A wide vocabulary keeps each term selective, like real posting text
+        syllables = ["ka", "lo", "mi", "ra", "te", "su", "no", "vi", "de", "po", "ze", "gu"]
+        vocabulary = ["".join(rng.choices(syllables, k=4)) for _ in range(5000)]
+        skills = ["Python", "Django", "React", "DevOps", "Kubernetes", "AWS", "Docker", "Java"]
+        roles = ["Developer", "Engineer", "Scientist", "Designer", "Manager"]
+        today = date.today()
+        batch = []
+        for i in range(count):
+            posting_date = today + timedelta(days=rng.randint(-60, 60))
+            batch.append(Job(
+                title=f"{rng.choice(vocabulary).title()} {rng.choice(roles)} {i}",
+                company=f"Company {rng.randint(1, 5000)}",
+                location=f"City {rng.randint(1, 500)}",
+                description=" ".join(rng.choices(vocabulary, k=60)),
+                required_skills=rng.sample(skills, 3),
+                posting_date=posting_date,
+                expiration_date=posting_date + timedelta(days=rng.randint(30, 90)),
+                status="active",
+            ))
+            if len(batch) == 5000:
+                resolve_lookups(batch)
+                Job.objects.bulk_create(batch)
+                batch = []
+        resolve_lookups(batch)
+        Job.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE jobs_job")
+        self.stdout.write(f"Seeded {count} synthetic jobs (seed {seed})")
+
+    def run(self, terms, iterations):
+        for term in terms:
+            self.measure(term, "trigram", Job.objects.filter(build_search_query(term)), iterations)
+            # The previous UPPER(col) LIKE predicate, for comparison
+            legacy = (
+                models.Q(title__icontains=term) |
+                models.Q(description__icontains=term) |
+                models.Q(company_ref__name__icontains=term)
+            )
+            self.measure(term, "icontains", Job.objects.filter(legacy), iterations)
+
+    def measure(self, term, label, qs, iterations):
+        qs = qs.order_by("-posting_date")[:10]
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        indexes = sorted(set(self.plan_indexes(plan[0]["Plan"])))
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            list(qs.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+        self.stdout.write(
+            f"{term!r} [{label}]: median {statistics.median(timings):.2f}ms, p99 {p99:.2f}ms, "
+            f"indexes used: {', '.join(indexes) or 'none (sequential scan)'}"
+        )
+
+    def plan_indexes(self, node):
+        if "Index Name" in node:
+            yield node["Index Name"]
+        for child in node.get("Plans", []):
+            yield from self.plan_indexes(child)
@@ -1,89 +1,62 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from jobs.ingest import BULK_BATCH_SIZE
 from jobs.models import Job
-from datetime import date, timedelta
-import random
+from jobs.testdata import analyze_jobs, deferred_indexes, load_jobs_parallel, restore_deferred_indexes
+from contextlib import nullcontext
+import time
 
 class Command(BaseCommand):
-    help = 'Generate 120 test job data'
+    help = 'Generate test job data (120 jobs by default) with batched COPY writes'
 
-    def handle(self, *args, **kwargs):
-        # Company Choices
-        companies = [
-            "Tech Solutions Inc.",
-            "Digital Innovations",
-            "Future Systems",
-            "Smart Tech",
-            "Global Software",
-            "Innovative Solutions",
-            "Tech Pioneers",
-            "Digital Dynamics",
-            "Future Technologies",
-            "Smart Systems"
-        ]
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=120, help='Number of jobs to generate (default: 120)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the generated data; the same seed and offset give the same jobs')
+        parser.add_argument('--offset', type=int,
+                            help='Number of the first generated job (default: the current number of jobs, '
+                                 'so reruns add new postings)')
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE,
+                            help=f'Rows per COPY batch (default: {BULK_BATCH_SIZE})')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes generating and writing batches in parallel (default: 1)')
+        parser.add_argument('--defer-indexes', action='store_true',
+                            help='Drop the secondary indexes during the load and rebuild them afterwards '
+                                 '(much faster for millions of rows; searches are slow until it finishes)')
+        parser.add_argument('--restore-indexes', action='store_true',
+                            help='Only rebuild the indexes left dropped by an interrupted --defer-indexes load')
 
-        # Position Choices
-        job_titles = [
-            "Senior Python Developer",
-            "Frontend Developer",
-            "Backend Developer",
-            "Full Stack Developer",
-            "DevOps Engineer",
-            "Data Scientist",
-            "Machine Learning Engineer",
-            "Mobile Developer",
-            "UI/UX Designer",
-            "Product Manager"
-        ]
+    def handle(self, *args, **options):
+        if options['restore_indexes']:
+            restored = restore_deferred_indexes(log=self.stdout.write)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {restored} deferred indexes'))
+            return
 
-        # Location Choices
-        locations = [
-            "Taipei, Taiwan",
-            "New Taipei, Taiwan",
-            "Taichung, Taiwan",
-            "Kaohsiung, Taiwan",
-            "Hsinchu, Taiwan"
-        ]
+        count = options['count']
+        if count <= 0 or options['batch_size'] <= 0 or options['workers'] <= 0:
+            raise CommandError('--count, --batch-size and --workers must be positive')
+        offset = options['offset'] if options['offset'] is not None else Job.objects.count()
 
-        # Skill Choices
-        all_skills = [
-            "Python", "JavaScript", "React", "Vue", "Angular",
-            "Django", "Flask", "Node.js", "TypeScript", "Java",
-            "Spring Boot", "PostgreSQL", "MongoDB", "Docker",
-            "Kubernetes", "AWS", "Azure", "GCP", "CI/CD",
-            "Git", "REST API", "GraphQL", "Microservices"
-        ]
+        started = time.perf_counter()
+        last_report = [started]
 
-        # Salary Range Choices
-        salary_ranges = [
-            "60,000 - 90,000 TWD",
-            "80,000 - 120,000 TWD",
-            "100,000 - 150,000 TWD",
-            "120,000 - 180,000 TWD",
-            "150,000 - 200,000 TWD"
-        ]
+        # Report progress at most once a second instead of once per row
+        def progress(created):
+            now = time.perf_counter()
+            if created == count or now - last_report[0] >= 1:
+                last_report[0] = now
+                rate = created / (now - started)
+                self.stdout.write(f'{created}/{count} jobs ({rate:,.0f} rows/s)')
 
-        # Generate 120 test data
-        for i in range(120):
-            # Randomly select posting date (60 days ago to 60 days from now)
-            posting_date = date.today() + timedelta(days=random.randint(-60, 60))
-            # Randomly select expiration date (30-90 days after posting date)
-            expiration_date = posting_date + timedelta(days=random.randint(30, 90))
-            
-            # Randomly select 2-4 skills
-            required_skills = random.sample(all_skills, random.randint(2, 4))
-            
-            # Create job
-            job = Job.objects.create(
-                title=random.choice(job_titles),
-                company=random.choice(companies),
-                location=random.choice(locations),
-                description=f"This is a test job posting #{i+1}. We are looking for a talented professional to join our team.",
-                salary_range=random.choice(salary_ranges),
-                required_skills=required_skills,
-                posting_date=posting_date,
-                expiration_date=expiration_date
+        indexes = deferred_indexes(log=self.stdout.write) if options['defer_indexes'] else nullcontext()
+        with indexes:
+            created = load_jobs_parallel(
+                count, seed=options['seed'], offset=offset, batch_size=options['batch_size'],
+                workers=options['workers'], progress=progress,
             )
-            
-            self.stdout.write(
-                self.style.SUCCESS(f'Successfully created job: {job.title} at {job.company}')
-            ) 
\ No newline at end of file
+        # Fresh planner statistics after a large load
+        analyze_jobs()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully created {created} jobs in {elapsed:.1f}s')
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from jobs.changes import prune_tombstones
+from jobs.scheduler import transition_job_statuses
+import time
+
+
+class Command(BaseCommand):
+    help = ('Move job statuses along scheduled -> active -> expired with set-based updates '
+            'and prune expired change feed tombstones')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running, transitioning every N seconds (default: run once)')
+
+    def handle(self, *args, **options):
+        while True:
+            result = transition_job_statuses()
+            if result is None:
+                self.stdout.write(self.style.WARNING('Another transition is running, skipped'))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Activated {result['activated']}, expired {result['expired']}, "
+                    f"rescheduled {result['rescheduled']} jobs"
+                ))
+            pruned = prune_tombstones()
+            if pruned:
+                self.stdout.write(f'Pruned {pruned} change feed tombstones')
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
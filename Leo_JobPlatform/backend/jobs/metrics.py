@@ -0,0 +1,22 @@
+from .cache import counters
+from .scheduler import stats
+
+
+# Response cache and status scheduler statistics for the /metrics endpoint
+def collect():
+    yield ("jobs_cache_requests_total", "counter", "Job response cache lookups by kind and result", [
+        ({"kind": kind, "result": result}, counters[f"{kind}_{counter}"])
+        for kind in ("list", "detail")
+        for result, counter in (("hit", "hits"), ("miss", "misses"))
+    ])
+    yield ("jobs_status_transition_runs_total", "counter", "Job status transition runs", [
+        ({"result": "completed"}, stats["runs"]),
+        ({"result": "skipped"}, stats["skipped_runs"]),
+    ])
+    yield ("jobs_status_transitions_total", "counter", "Jobs moved by status transitions", [
+        ({"transition": name}, stats[name]) for name in ("activated", "expired", "rescheduled")
+    ])
+    if stats["last_duration_ms"] is not None:
+        yield ("jobs_status_transition_last_duration_seconds", "gauge", "Duration of the last transition run", [
+            ({}, stats["last_duration_ms"] / 1000),
+        ])
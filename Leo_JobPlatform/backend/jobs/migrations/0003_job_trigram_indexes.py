@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so the migration doesn't lock jobs_job for writes
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0002_job_status'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='job_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='job_description_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['company'], name='job_company_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='job_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
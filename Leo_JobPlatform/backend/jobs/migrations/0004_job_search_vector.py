@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+# Keeps jobs_job.search_vector in sync with the searchable columns on every write path
+# (ORM saves, bulk_create, COPY and raw UPDATEs alike).
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.company, '')), 'B') ||
+        setweight(to_tsvector('english', array_to_string(coalesce(NEW.required_skills, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_search_vector
+    BEFORE INSERT OR UPDATE OF title, company, required_skills, description, search_vector
+    ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS jobs_job_search_vector ON jobs_job;
+DROP FUNCTION IF EXISTS jobs_job_search_vector_update();
+"""
+
+# Rows of jobs_job refreshed per UPDATE, so the backfill never holds row locks
+# on (or rewrites) the whole table in one transaction
+BACKFILL_BATCH_SIZE = 10000
+
+
+# Backfill existing rows through the trigger in id ranges of BACKFILL_BATCH_SIZE,
+# each UPDATE committed on its own. The trigger is in place first, so rows
+# written meanwhile get their vector on write and need no catch-up pass.
+def backfill_search_vectors(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT min(id), max(id) FROM jobs_job")
+        low, high = cursor.fetchone()
+        if low is None:
+            return
+        for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+            cursor.execute(
+                "UPDATE jobs_job SET search_vector = NULL WHERE id >= %s AND id < %s",
+                [start, start + BACKFILL_BATCH_SIZE],
+            )
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits batch by batch and the index is built concurrently,
+    # so jobs_job stays writable throughout
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0003_job_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ),
+    ]
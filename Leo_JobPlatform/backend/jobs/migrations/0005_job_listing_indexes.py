@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so the migration doesn't lock jobs_job for writes
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0004_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='job',
+            options={'ordering': ['-posting_date', '-id']},
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['-posting_date', '-id'], name='job_posting_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['expiration_date', 'id'], name='job_expiration_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['status', '-posting_date', '-id'], name='job_status_posting_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['status', 'expiration_date', 'id'], name='job_status_expiration_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-posting_date', '-id'], name='job_active_posting_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expiration_date', 'id'], name='job_active_expiration_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:35
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so the migration doesn't lock jobs_job for writes
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0005_job_listing_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['required_skills'], name='job_skills_gin_idx'),
+        ),
+    ]
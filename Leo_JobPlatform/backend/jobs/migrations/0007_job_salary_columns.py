@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:38
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so the migration doesn't lock jobs_job for writes.
+    # Existing rows are parsed afterwards with `manage.py backfill_salary`.
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0006_job_skills_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='currency',
+            field=models.CharField(blank=True, default='', editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(models.OrderBy(models.F('salary_max'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='job_salary_max_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['salary_min'], name='job_salary_min_idx'),
+        ),
+    ]
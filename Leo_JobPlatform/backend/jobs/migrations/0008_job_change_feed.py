@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:08
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# Records a tombstone for every deleted job, whatever the delete path. A statement
+# level trigger with a transition table keeps bulk deletes a single INSERT.
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION jobs_job_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO jobs_jobtombstone (job_id, deleted_at)
+    SELECT id, clock_timestamp() FROM deleted_jobs
+    ON CONFLICT (job_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_tombstone
+    AFTER DELETE ON jobs_job
+    REFERENCING OLD TABLE AS deleted_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION jobs_job_record_tombstones();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS jobs_job_tombstone ON jobs_job;
+DROP FUNCTION IF EXISTS jobs_job_record_tombstones();
+"""
+
+
+class Migration(migrations.Migration):
+
+    # The updated_at index is built concurrently so the migration doesn't lock jobs_job for writes
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0007_job_salary_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTombstone',
+            fields=[
+                ('job_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at', 'job_id'], name='job_tombstone_deleted_idx')],
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['updated_at', 'id'], name='job_updated_at_idx'),
+        ),
+    ]
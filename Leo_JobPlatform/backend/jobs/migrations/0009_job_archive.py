@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+# Tombstones of rows moved by archive_jobs (which sets jobs.archiving for its
+# transaction) are flagged, so the change feed reports them as archived
+ARCHIVE_AWARE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO jobs_jobtombstone (job_id, deleted_at, archived)
+    SELECT id, clock_timestamp(), coalesce(current_setting('jobs.archiving', true), '') = 'on'
+    FROM deleted_jobs
+    ON CONFLICT (job_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at, archived = EXCLUDED.archived;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO jobs_jobtombstone (job_id, deleted_at)
+    SELECT id, clock_timestamp() FROM deleted_jobs
+    ON CONFLICT (job_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobArchive',
+            fields=[
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=255)),
+                ('salary_range', models.CharField(blank=True, max_length=100)),
+                ('salary_min', models.PositiveIntegerField(blank=True, editable=False, null=True)),
+                ('salary_max', models.PositiveIntegerField(blank=True, editable=False, null=True)),
+                ('currency', models.CharField(blank=True, default='', editable=False, max_length=3)),
+                ('company', models.CharField(max_length=255)),
+                ('required_skills', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None)),
+                ('posting_date', models.DateField()),
+                ('expiration_date', models.DateField()),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('active', 'Active'), ('expired', 'Expired')], default='scheduled', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-posting_date', '-id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='jobtombstone',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunSQL(ARCHIVE_AWARE_TRIGGER_SQL, PREVIOUS_TRIGGER_SQL),
+    ]
@@ -0,0 +1,335 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+# Rows of jobs_job / jobs_jobarchive given their keys per UPDATE, so the backfill
+# never holds row locks on (or rewrites) the whole table in one transaction
+BACKFILL_BATCH_SIZE = 10000
+
+# The company name now lives in jobs_company, so the trigger looks it up by key.
+# Function and trigger are replaced in place (one statement each), so there is
+# no moment without a trigger in which a write would miss its search_vector:
+# the previous trigger briefly calls the new function, which only needs
+# company_id, and jobs_fill_lookup_keys fires before it (triggers run by name).
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((SELECT name FROM jobs_company WHERE id = NEW.company_id), '')), 'B') ||
+        setweight(to_tsvector('english', array_to_string(coalesce(NEW.required_skills, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER jobs_job_search_vector
+    BEFORE INSERT OR UPDATE OF title, company_id, required_skills, description, search_vector
+    ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update();
+"""
+
+PREVIOUS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.company, '')), 'B') ||
+        setweight(to_tsvector('english', array_to_string(coalesce(NEW.required_skills, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER jobs_job_search_vector
+    BEFORE INSERT OR UPDATE OF title, company, required_skills, description, search_vector
+    ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update();
+"""
+
+JOB_TABLES = ("jobs_job", "jobs_jobarchive")
+
+# While the migration runs, processes still on the previous code keep writing
+# names only. This trigger gives those rows their keys (adding new names to the
+# lookup tables), so no row is left without keys once the backfill is done.
+CREATE_FILL_TRIGGER_SQL = """
+CREATE FUNCTION jobs_fill_lookup_keys() RETURNS trigger AS $$
+BEGIN
+    IF NEW.company_id IS NULL OR TG_OP = 'UPDATE' AND NEW.company IS DISTINCT FROM OLD.company THEN
+        INSERT INTO jobs_company (name) VALUES (NEW.company) ON CONFLICT (name) DO NOTHING;
+        SELECT id INTO NEW.company_id FROM jobs_company WHERE name = NEW.company;
+    END IF;
+    IF NEW.location_id IS NULL OR TG_OP = 'UPDATE' AND NEW.location IS DISTINCT FROM OLD.location THEN
+        INSERT INTO jobs_location (name) VALUES (NEW.location) ON CONFLICT (name) DO NOTHING;
+        SELECT id INTO NEW.location_id FROM jobs_location WHERE name = NEW.location;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_fill_lookup_keys
+    BEFORE INSERT OR UPDATE ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_fill_lookup_keys();
+
+CREATE TRIGGER jobs_jobarchive_fill_lookup_keys
+    BEFORE INSERT OR UPDATE ON jobs_jobarchive
+    FOR EACH ROW EXECUTE FUNCTION jobs_fill_lookup_keys();
+"""
+
+# SET NOT NULL scans the whole table under an ACCESS EXCLUSIVE lock unless a
+# valid CHECK already proves it. NOT VALID + VALIDATE builds that proof while
+# writes continue (VALIDATE only takes SHARE UPDATE EXCLUSIVE).
+KEY_COLUMNS = [(table, column) for table in JOB_TABLES for column in ("company_id", "location_id")]
+
+ADD_NOT_NULL_CHECKS_SQL = [
+    statement
+    for table, column in KEY_COLUMNS
+    for statement in (
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_not_null_check CHECK ({column} IS NOT NULL) NOT VALID",
+        f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_not_null_check",
+    )
+]
+
+DROP_NOT_NULL_CHECKS_SQL = [
+    f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_{column}_not_null_check" for table, column in KEY_COLUMNS
+]
+
+DROP_FILL_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS jobs_job_fill_lookup_keys ON jobs_job;
+DROP TRIGGER IF EXISTS jobs_jobarchive_fill_lookup_keys ON jobs_jobarchive;
+DROP FUNCTION IF EXISTS jobs_fill_lookup_keys();
+"""
+
+
+# Fill the lookup tables from the distinct names, then give every job its keys in
+# id ranges of BACKFILL_BATCH_SIZE, each UPDATE committed on its own. The UPDATEs
+# only touch the key columns, so neither the search_vector trigger nor updated_at
+# (and with it the change feed) is affected. Rerunning skips rows already done.
+# Rows written meanwhile get their keys from jobs_fill_lookup_keys; a final pass
+# per table repeats until no row without keys is left, so the NOT NULL that
+# follows cannot fail halfway.
+def backfill_keys(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for name in ("company", "location"):
+            sources = " UNION ".join(f"SELECT {name} FROM {table}" for table in JOB_TABLES)
+            cursor.execute(
+                f"INSERT INTO jobs_{name} (name) SELECT DISTINCT {name} FROM ({sources}) AS names "
+                f"ON CONFLICT (name) DO NOTHING"
+            )
+        for table in JOB_TABLES:
+            cursor.execute(f"SELECT min(id), max(id) FROM {table}")
+            low, high = cursor.fetchone()
+            if low is None:
+                continue
+            for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+                cursor.execute(
+                    f"""
+                    UPDATE {table} AS job SET company_id = company.id, location_id = location.id
+                    FROM jobs_company AS company, jobs_location AS location
+                    WHERE company.name = job.company AND location.name = job.location
+                      AND job.id >= %s AND job.id < %s AND job.company_id IS NULL
+                    """,
+                    [start, start + BACKFILL_BATCH_SIZE],
+                )
+            # Catch-up: rows the batches missed, e.g. committed below `high` after
+            # their range was done; the trigger fills their keys on this UPDATE
+            while True:
+                cursor.execute(
+                    f"""
+                    UPDATE {table} SET company_id = company_id WHERE id IN (
+                        SELECT id FROM {table} WHERE company_id IS NULL OR location_id IS NULL
+                        LIMIT %s
+                    )
+                    """,
+                    [BACKFILL_BATCH_SIZE],
+                )
+                if not cursor.rowcount:
+                    break
+
+
+# Reverse of backfill_keys: copy the names back into the text columns
+def restore_names(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table in JOB_TABLES:
+            cursor.execute(f"SELECT min(id), max(id) FROM {table}")
+            low, high = cursor.fetchone()
+            if low is None:
+                continue
+            for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+                cursor.execute(
+                    f"""
+                    UPDATE {table} AS job SET company = company.name, location = location.name
+                    FROM jobs_company AS company, jobs_location AS location
+                    WHERE company.id = job.company_id AND location.id = job.location_id
+                      AND job.id >= %s AND job.id < %s
+                    """,
+                    [start, start + BACKFILL_BATCH_SIZE],
+                )
+            while True:
+                cursor.execute(
+                    f"""
+                    UPDATE {table} AS job SET company = company.name, location = location.name
+                    FROM jobs_company AS company, jobs_location AS location
+                    WHERE company.id = job.company_id AND location.id = job.location_id
+                      AND job.id IN (
+                        SELECT id FROM {table} WHERE company IS NULL OR location IS NULL LIMIT %s
+                      )
+                    """,
+                    [BACKFILL_BATCH_SIZE],
+                )
+                if not cursor.rowcount:
+                    break
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits batch by batch and the indexes are built concurrently,
+    # so jobs_job stays writable throughout
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0009_job_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'companies',
+                'ordering': ['name'],
+                'abstract': False,
+                'indexes': [
+                    models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='company_name_prefix_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['name'], name='company_name_trgm_idx', opclasses=['gin_trgm_ops']),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+                'indexes': [
+                    models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='location_name_prefix_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['name'], name='location_name_trgm_idx', opclasses=['gin_trgm_ops']),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='company_ref',
+            field=models.ForeignKey(db_column='company_id', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.company'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='location_ref',
+            field=models.ForeignKey(db_column='location_id', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.location'),
+        ),
+        migrations.AddField(
+            model_name='jobarchive',
+            name='company_ref',
+            field=models.ForeignKey(db_column='company_id', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.company'),
+        ),
+        migrations.AddField(
+            model_name='jobarchive',
+            name='location_ref',
+            field=models.ForeignKey(db_column='location_id', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.location'),
+        ),
+        # The names are dropped below; nullable until then so that reversing
+        # can add them back to a populated table and refill them
+        migrations.AlterField(
+            model_name='job',
+            name='company',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='location',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='jobarchive',
+            name='company',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='jobarchive',
+            name='location',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RunSQL(CREATE_FILL_TRIGGER_SQL, DROP_FILL_TRIGGER_SQL),
+        migrations.RunPython(backfill_keys, restore_names),
+        # The old trigger fires on UPDATE OF company; dropping the column would
+        # drop it with it, so it is switched to company_id first
+        migrations.RunSQL(CREATE_TRIGGER_SQL, PREVIOUS_TRIGGER_SQL),
+        # NOT NULL while the fill trigger is still in place: from here on rows
+        # written by the previous code either get keys or are rejected
+        migrations.RunSQL(ADD_NOT_NULL_CHECKS_SQL, DROP_NOT_NULL_CHECKS_SQL),
+        migrations.AlterField(
+            model_name='job',
+            name='company_ref',
+            field=models.ForeignKey(db_column='company_id', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.company'),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='location_ref',
+            field=models.ForeignKey(db_column='location_id', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.location'),
+        ),
+        migrations.AlterField(
+            model_name='jobarchive',
+            name='company_ref',
+            field=models.ForeignKey(db_column='company_id', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.company'),
+        ),
+        migrations.AlterField(
+            model_name='jobarchive',
+            name='location_ref',
+            field=models.ForeignKey(db_column='location_id', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='jobs.location'),
+        ),
+        migrations.RunSQL(DROP_NOT_NULL_CHECKS_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(DROP_FILL_TRIGGER_SQL, CREATE_FILL_TRIGGER_SQL),
+        RemoveIndexConcurrently(
+            model_name='job',
+            name='job_company_trgm_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='job',
+            name='job_location_trgm_idx',
+        ),
+        migrations.RemoveField(
+            model_name='job',
+            name='company',
+        ),
+        migrations.RemoveField(
+            model_name='job',
+            name='location',
+        ),
+        migrations.RemoveField(
+            model_name='jobarchive',
+            name='company',
+        ),
+        migrations.RemoveField(
+            model_name='jobarchive',
+            name='location',
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['company_ref'], name='job_company_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['location_ref'], name='job_location_idx'),
+        ),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+
+# Jobs given their buckets per INSERT of the backfill
+BACKFILL_BATCH_SIZE = 10000
+
+# MinHash signature of a job: for each of 48 seeded hash functions, the minimum
+# hash over its features (lowercased skills, title words and the location key).
+# The signature is cut into 8 bands of 6 values and each band hashed to a bucket,
+# so two jobs with Jaccard similarity s share at least one bucket with
+# probability 1 - (1 - s^6)^8 (about 0.91 at s = 0.8, 0.12 at s = 0.5). A ninth
+# bucket holds the whole feature set, collecting the exact duplicates that the
+# bounded bucket reads would otherwise spread thin.
+CREATE_FUNCTIONS_SQL = """
+CREATE FUNCTION jobs_similarity_features(title text, skills varchar[], location_id bigint) RETURNS text[] AS $$
+    SELECT coalesce(array_agg(DISTINCT feature ORDER BY feature), '{}') FROM (
+        SELECT 's:' || lower(skill) FROM unnest(skills) AS skill
+        UNION ALL
+        SELECT 't:' || word FROM regexp_split_to_table(lower(title), '[^a-z0-9+#]+') AS word WHERE word <> ''
+        UNION ALL
+        SELECT 'l:' || location_id
+    ) AS features (feature)
+    WHERE feature IS NOT NULL
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE FUNCTION jobs_similarity_buckets(title text, skills varchar[], location_id bigint) RETURNS bigint[] AS $$
+    SELECT (SELECT array_agg(hashtextextended(band || ':' || signature, 0) ORDER BY band) FROM (
+        SELECT seed / 6 AS band, string_agg(minimum::text, ',' ORDER BY seed) AS signature
+        FROM (
+            SELECT seed, min(hashtextextended(feature, seed)) AS minimum
+            FROM unnest(jobs_similarity_features(title, skills, location_id)) AS feature,
+                 generate_series(0, 47) AS seed
+            GROUP BY seed
+        ) AS minhash
+        GROUP BY seed / 6
+    ) AS bands) || hashtextextended(array_to_string(jobs_similarity_features(title, skills, location_id), ','), 0)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+"""
+
+DROP_FUNCTIONS_SQL = """
+DROP FUNCTION IF EXISTS jobs_similarity_buckets(text, varchar[], bigint);
+DROP FUNCTION IF EXISTS jobs_similarity_features(text, varchar[], bigint);
+"""
+
+# Statement level triggers with transition tables, so a COPY batch or bulk UPDATE
+# refreshes its buckets with one statement. Updates only rebucket the jobs whose
+# skills, title or location changed (status transitions leave them alone).
+CREATE_TRIGGERS_SQL = """
+CREATE FUNCTION jobs_job_refresh_similarity() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO jobs_jobsimilaritybucket (bucket, job_id)
+        SELECT unnest(jobs_similarity_buckets(title, required_skills, location_id)), id FROM new_jobs
+        ON CONFLICT DO NOTHING;
+    ELSIF TG_OP = 'UPDATE' THEN
+        DELETE FROM jobs_jobsimilaritybucket AS entry
+        USING new_jobs AS job, old_jobs AS previous
+        WHERE entry.job_id = job.id AND previous.id = job.id
+          AND (job.title, job.required_skills, job.location_id)
+              IS DISTINCT FROM (previous.title, previous.required_skills, previous.location_id);
+        INSERT INTO jobs_jobsimilaritybucket (bucket, job_id)
+        SELECT unnest(jobs_similarity_buckets(job.title, job.required_skills, job.location_id)), job.id
+        FROM new_jobs AS job JOIN old_jobs AS previous ON previous.id = job.id
+        WHERE (job.title, job.required_skills, job.location_id)
+              IS DISTINCT FROM (previous.title, previous.required_skills, previous.location_id)
+        ON CONFLICT DO NOTHING;
+    ELSE
+        DELETE FROM jobs_jobsimilaritybucket AS entry USING old_jobs AS previous WHERE entry.job_id = previous.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_similarity_insert
+    AFTER INSERT ON jobs_job
+    REFERENCING NEW TABLE AS new_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION jobs_job_refresh_similarity();
+
+CREATE TRIGGER jobs_job_similarity_update
+    AFTER UPDATE ON jobs_job
+    REFERENCING OLD TABLE AS old_jobs NEW TABLE AS new_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION jobs_job_refresh_similarity();
+
+CREATE TRIGGER jobs_job_similarity_delete
+    AFTER DELETE ON jobs_job
+    REFERENCING OLD TABLE AS old_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION jobs_job_refresh_similarity();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS jobs_job_similarity_insert ON jobs_job;
+DROP TRIGGER IF EXISTS jobs_job_similarity_update ON jobs_job;
+DROP TRIGGER IF EXISTS jobs_job_similarity_delete ON jobs_job;
+DROP FUNCTION IF EXISTS jobs_job_refresh_similarity();
+"""
+
+
+# Bucket the existing jobs in id ranges, each INSERT committed on its own. The
+# triggers are already in place, so jobs written meanwhile are covered either way.
+def backfill_buckets(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT min(id), max(id) FROM jobs_job")
+        low, high = cursor.fetchone()
+        if low is None:
+            return
+        for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+            cursor.execute(
+                """
+                INSERT INTO jobs_jobsimilaritybucket (bucket, job_id)
+                SELECT unnest(jobs_similarity_buckets(title, required_skills, location_id)), id
+                FROM jobs_job WHERE id >= %s AND id < %s
+                ON CONFLICT DO NOTHING
+                """,
+                [start, start + BACKFILL_BATCH_SIZE],
+            )
+        cursor.execute("ANALYZE jobs_jobsimilaritybucket")
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits batch by batch
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0010_company_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSimilarityBucket',
+            fields=[
+                ('pk', models.CompositePrimaryKey('bucket', 'job_id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('bucket', models.BigIntegerField()),
+                ('job_id', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job_id'], name='job_similarity_job_idx')],
+            },
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS_SQL, DROP_FUNCTIONS_SQL),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+        migrations.RunPython(backfill_buckets, migrations.RunPython.noop),
+    ]
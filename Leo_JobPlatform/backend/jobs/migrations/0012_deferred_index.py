@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_similarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeferredIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=63, unique=True)),
+                ('definition', models.TextField()),
+                ('dropped_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:47
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# Every write to a job or tombstone is stamped with the id of the writing
+# transaction and a number from jobs_change_seq, which orders the writes of one
+# transaction. The sequence may hand each session a block of numbers: only the
+# order within a transaction (a single session) matters. Existing rows keep
+# (0, 0) and sort by id ahead of every later change.
+CREATE_TRIGGERS_SQL = """
+CREATE SEQUENCE jobs_change_seq CACHE 1000;
+
+CREATE FUNCTION jobs_stamp_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    NEW.change_seq := nextval('jobs_change_seq');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_change
+    BEFORE INSERT OR UPDATE ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_stamp_change();
+
+CREATE TRIGGER jobs_jobtombstone_change
+    BEFORE INSERT OR UPDATE ON jobs_jobtombstone
+    FOR EACH ROW EXECUTE FUNCTION jobs_stamp_change();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS jobs_job_change ON jobs_job;
+DROP TRIGGER IF EXISTS jobs_jobtombstone_change ON jobs_jobtombstone;
+DROP FUNCTION IF EXISTS jobs_stamp_change();
+DROP SEQUENCE IF EXISTS jobs_change_seq;
+"""
+
+
+class Migration(migrations.Migration):
+
+    # The jobs_job index is built concurrently so the migration doesn't lock it for writes
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0012_deferred_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='change_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobtombstone',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobtombstone',
+            name='change_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['change_xid', 'change_seq', 'id'], name='job_change_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobtombstone',
+            index=models.Index(fields=['change_xid', 'change_seq', 'job_id'], name='job_tombstone_change_idx'),
+        ),
+    ]
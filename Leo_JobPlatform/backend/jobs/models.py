@@ -1,13 +1,131 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.db.models.lookups import GreaterThan, LessThan
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from datetime import date, datetime
+from .salary import parse_salary_range
 
 User = get_user_model()
 
-class Job(models.Model):
-    # Using Celery beat to regularlyhandle the status of the job
-    # by checking if the posting date is in the future or the expiration date is in the past
+# Text search configuration of Job.search_vector (see the jobs_job_search_vector trigger)
+SEARCH_CONFIG = "english"
+
+def to_date(value):
+    # The API schemas accept datetimes, the model stores plain dates
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+# Status of a posting on `today`: before the posting date it is scheduled,
+# after the expiration date it is expired, otherwise active
+def compute_status(posting_date, expiration_date, today=None):
+    today = today or date.today()
+    if posting_date > today:
+        return "scheduled"
+    elif expiration_date < today:
+        return "expired"
+    return "active"
+
+# compute_status as a SQL expression over date expressions (column names, F() or
+# Value()), so set-based UPDATEs can recompute statuses without loading rows
+def status_expression(posting_date="posting_date", expiration_date="expiration_date", today=None):
+    today = today or date.today()
+    if isinstance(posting_date, str):
+        posting_date = models.F(posting_date)
+    if isinstance(expiration_date, str):
+        expiration_date = models.F(expiration_date)
+    return models.Case(
+        models.When(GreaterThan(posting_date, today), then=models.Value("scheduled")),
+        models.When(LessThan(expiration_date, today), then=models.Value("expired")),
+        default=models.Value("active"),
+    )
+
+# Normalized company and location names. Jobs reference them by integer key, so
+# the name filters are resolved against these small tables and applied to jobs_job
+# as integer lookups, and every job row carries two keys instead of two strings.
+class LookupName(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        abstract = True
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+class Company(LookupName):
+    class Meta(LookupName.Meta):
+        verbose_name_plural = "companies"
+        indexes = [
+            # Case-insensitive prefix search (autocomplete): UPPER(name) LIKE 'PREFIX%'
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="company_name_prefix_idx"),
+            # Substring filters of the job listings
+            GinIndex(fields=["name"], name="company_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
+
+class Location(LookupName):
+    class Meta(LookupName.Meta):
+        indexes = [
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="location_name_prefix_idx"),
+            GinIndex(fields=["name"], name="location_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
+
+# Job fields holding a Company/Location key -> lookup model, by the name they are
+# read and written as
+LOOKUP_FIELDS = {"company": Company, "location": Location}
+
+# The name behind a lookup key, read and assigned like the former text column
+# (Job(company="Tech Corp"), job.location = "Remote"). An assigned name is kept
+# pending, without touching the database, until save() or resolve_lookups() turns
+# it into a key, so building jobs stays safe in async code.
+def lookup_name(name):
+    pending = f"_pending_{name}"
+
+    def get(self):
+        if pending in self.__dict__:
+            return self.__dict__[pending]
+        return getattr(self, f"{name}_ref").name
+
+    def set(self, value):
+        self.__dict__[pending] = value
+
+    return property(get, set)
+
+# Resolve the pending company/location names of `jobs` to keys with one
+# INSERT ... ON CONFLICT DO NOTHING and one SELECT per lookup table. The names stay
+# pending, so a batch rolled back and written again resolves them again.
+def resolve_lookups(jobs):
+    for name, model in LOOKUP_FIELDS.items():
+        pending = f"_pending_{name}"
+        names = {job.__dict__[pending] for job in jobs if pending in job.__dict__}
+        if not names:
+            continue
+        # Sorted, so concurrent loaders lock new names in the same order
+        model.objects.bulk_create([model(name=value) for value in sorted(names)], ignore_conflicts=True)
+        keys = dict(model.objects.filter(name__in=names).values_list("name", "id"))
+        for job in jobs:
+            if pending in job.__dict__:
+                setattr(job, f"{name}_ref_id", keys[job.__dict__[pending]])
+
+class JobQuerySet(models.QuerySet):
+    # .values() that also projects the company and location names
+    def values_with_names(self, *fields):
+        names = {name: models.F(f"{name}_ref__name") for name in LOOKUP_FIELDS if name in fields}
+        return self.annotate(**names).values(*fields)
+
+# Jobs are always read with their company and location, so serializing them never
+# lazy-loads a name (which async views could not do)
+class JobManager(models.Manager.from_queryset(JobQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().select_related(*(f"{name}_ref" for name in LOOKUP_FIELDS))
+
+# Columns shared by live jobs and their archive
+class JobFields(models.Model):
+    # Status is computed on save and kept current as dates pass by the set-based
+    # transitions in jobs.scheduler (update_job_status command or in-process runner)
     STATUS_CHOICES = [
         ("scheduled", "Scheduled"),
         ("active", "Active"),
@@ -16,9 +134,20 @@ class Job(models.Model):
 
     title = models.CharField(max_length=255)
     description = models.TextField()
-    location = models.CharField(max_length=255)
+    # Keys into the lookup tables, read and written by name through the company and
+    # location properties below; indexed on Job only (archived jobs are fetched by id)
+    company_ref = models.ForeignKey(
+        Company, on_delete=models.PROTECT, db_column="company_id", related_name="+", db_index=False,
+    )
+    location_ref = models.ForeignKey(
+        Location, on_delete=models.PROTECT, db_column="location_id", related_name="+", db_index=False,
+    )
     salary_range = models.CharField(max_length=100, blank=True)
-    company = models.CharField(max_length=255)
+    # Bounds and currency parsed from salary_range on save (see jobs.salary);
+    # null when the text holds no amount
+    salary_min = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    salary_max = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    currency = models.CharField(max_length=3, blank=True, default="", editable=False)
     required_skills = ArrayField(models.CharField(max_length=100), blank=True, default=list)
     posting_date = models.DateField()
     expiration_date = models.DateField()
@@ -28,24 +157,139 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    company = lookup_name("company")
+    location = lookup_name("location")
+
+    objects = JobManager()
+
     class Meta:
-        ordering = ['-posting_date']
+        abstract = True
+
+    def __str__(self):
+        return f"{self.title} at {self.company}"
+
+    # Turn assigned company/location names into keys, creating missing lookup rows
+    def resolve_lookups(self):
+        for name, model in LOOKUP_FIELDS.items():
+            value = self.__dict__.pop(f"_pending_{name}", None)
+            if value is not None:
+                setattr(self, f"{name}_ref", model.objects.get_or_create(name=value)[0])
+
+class Job(JobFields):
+    # Weighted tsvector over title (A), company and required_skills (B) and description (C),
+    # maintained by a database trigger so bulk writes and raw UPDATEs keep it in sync
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Change feed position of the last write (jobs.changes): the writing transaction's
+    # id and a sequence number within it, stamped by the jobs_job_change trigger
+    change_xid = models.BigIntegerField(default=0, editable=False)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        ordering = ['-posting_date', '-id']
+        indexes = [
+            # B-tree indexes matching the list_jobs sort orders, alone and behind the status filter
+            models.Index(fields=['-posting_date', '-id'], name='job_posting_date_idx'),
+            models.Index(fields=['expiration_date', 'id'], name='job_expiration_date_idx'),
+            models.Index(fields=['status', '-posting_date', '-id'], name='job_status_posting_idx'),
+            models.Index(fields=['status', 'expiration_date', 'id'], name='job_status_expiration_idx'),
+            # Smaller partial indexes for the hot "active jobs" listing
+            models.Index(
+                fields=['-posting_date', '-id'], name='job_active_posting_idx',
+                condition=models.Q(status='active'),
+            ),
+            models.Index(
+                fields=['expiration_date', 'id'], name='job_active_expiration_idx',
+                condition=models.Q(status='active'),
+            ),
+            # Trigram indexes serving the substring search/filters in list_jobs
+            GinIndex(fields=['title'], name='job_title_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['description'], name='job_description_trgm_idx', opclasses=['gin_trgm_ops']),
+            # Company/location filters (integer keys resolved from the lookup tables)
+            models.Index(fields=['company_ref'], name='job_company_idx'),
+            models.Index(fields=['location_ref'], name='job_location_idx'),
+            # Full-text index serving search_mode=fulltext
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+            # Array index serving the skill filters (&&, @>) and skill matching
+            GinIndex(fields=['required_skills'], name='job_skills_gin_idx'),
+            # Salary range filters and order_by=salary (highest pay first, unparsed last)
+            models.Index(
+                models.F('salary_max').desc(nulls_last=True), models.F('id').desc(),
+                name='job_salary_max_idx',
+            ),
+            models.Index(fields=['salary_min'], name='job_salary_min_idx'),
+            # Keyset scans of the change feed (jobs.changes), and its `since` start
+            models.Index(fields=['change_xid', 'change_seq', 'id'], name='job_change_idx'),
+            models.Index(fields=['updated_at', 'id'], name='job_updated_at_idx'),
+        ]
 
     def save(self, *args, **kwargs):
-        today = date.today()
-
-        if isinstance(self.posting_date, datetime):
-            self.posting_date = self.posting_date.date()
-        if isinstance(self.expiration_date, datetime):
-            self.expiration_date = self.expiration_date.date()
-
-        if self.posting_date > today:
-            self.status = "scheduled"
-        elif self.expiration_date < today:
-            self.status = "expired"
-        else:
-            self.status = "active"
+        self.posting_date = to_date(self.posting_date)
+        self.expiration_date = to_date(self.expiration_date)
+        self.status = compute_status(self.posting_date, self.expiration_date)
+        self.salary_min, self.salary_max, self.currency = parse_salary_range(self.salary_range)
+        self.resolve_lookups()
         super().save(*args, **kwargs)
 
+# Cold storage for jobs long past their expiration date, moved out of jobs_job
+# by the archive_jobs command so the serving table and its indexes only hold the
+# hot working set. Rows keep their ids; get_job falls back to this table.
+class JobArchive(JobFields):
+    id = models.BigIntegerField(primary_key=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-posting_date', '-id']
+
+# Deleted (or archived) jobs, for the change feed (jobs.changes). Rows are written
+# by the jobs_job_tombstone trigger, so every delete path (ORM, bulk delete, raw
+# SQL) is recorded, and pruned after JOBS_TOMBSTONE_RETENTION_DAYS.
+class JobTombstone(models.Model):
+    job_id = models.BigIntegerField(primary_key=True)
+    deleted_at = models.DateTimeField()
+    archived = models.BooleanField(default=False)  # moved to JobArchive rather than deleted
+    # Change feed position, stamped like Job's by the jobs_jobtombstone_change trigger
+    change_xid = models.BigIntegerField(default=0, editable=False)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'job_id'], name='job_tombstone_deleted_idx'),
+            models.Index(fields=['change_xid', 'change_seq', 'job_id'], name='job_tombstone_change_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.title} at {self.company}"
+        return f"Job {self.job_id} deleted at {self.deleted_at}"
+
+# Secondary indexes of jobs_job dropped for a bulk load (jobs.testdata.deferred_indexes)
+# and not rebuilt yet. A row is written in the transaction that drops its index and
+# deleted in the one that recreates it, so a load killed halfway leaves the
+# definitions behind for restore_deferred_indexes (generate_test_data --restore-indexes).
+class DeferredIndex(models.Model):
+    name = models.CharField(max_length=63, unique=True)
+    definition = models.TextField()
+    dropped_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+# MinHash/LSH buckets of the live jobs, for the similar-jobs lookup (jobs.similarity).
+# Every job lands in one bucket per band of its MinHash signature over its skills,
+# title words and location, plus one for the whole feature set (exact duplicates);
+# jobs sharing a bucket are likely to be similar. Needs Django 5.2 for the
+# composite primary key. Rows
+# are kept in sync by triggers on jobs_job (see migration 0011), so every write
+# path (ORM, COPY ingest, PATCH, bulk updates, deletes and archiving) refreshes
+# exactly the jobs it touched.
+class JobSimilarityBucket(models.Model):
+    pk = models.CompositePrimaryKey("bucket", "job_id")
+    bucket = models.BigIntegerField()
+    job_id = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # Trigger refreshes of the buckets of one job
+            models.Index(fields=['job_id'], name='job_similarity_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} in bucket {self.bucket}"
@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.db import connections, models
+from ninja.errors import HttpError
+
+# Keyset orderings available to cursor pagination: order_by -> (date field, descending).
+# Every ordering is made total with `id` as a tie-breaker so a cursor identifies
+# exactly one position in the result set.
+CURSOR_ORDERINGS = {
+    "posting_date": ("posting_date", True),       # newest first
+    "expiration_date": ("expiration_date", False),  # earliest expiration first
+}
+DEFAULT_CURSOR_ORDERING = "posting_date"
+DEFAULT_CURSOR_PAGE_SIZE = 10
+
+
+def encode_cursor(order_by: str, value: date, pk: int) -> str:
+    raw = json.dumps({"o": order_by, "v": value.isoformat(), "id": pk}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, pk = date.fromisoformat(data["v"]), int(data["id"])
+    except (ValueError, TypeError, KeyError):
+        raise HttpError(400, "Invalid cursor")
+    if data.get("o") != order_by:
+        raise HttpError(400, "Cursor does not match order_by")
+    return value, pk
+
+
+# Return one page after `cursor` plus the cursor of the following page (None on the last page).
+# The page is located with an index range condition instead of OFFSET, so its cost does
+# not depend on how deep the client has paged.
+async def paginate_by_cursor(qs, order_by: str, cursor: str, page_size: int):
+    if order_by not in CURSOR_ORDERINGS:
+        order_by = DEFAULT_CURSOR_ORDERING
+    if page_size <= 0:
+        page_size = DEFAULT_CURSOR_PAGE_SIZE
+    field, descending = CURSOR_ORDERINGS[order_by]
+
+    if cursor:
+        value, pk = decode_cursor(cursor, order_by)
+        # (field, id) < (value, pk) for descending order, > for ascending; the redundant
+        # `field <= value` bound lets PostgreSQL use it as an index range condition
+        op, bound = ("lt", "lte") if descending else ("gt", "gte")
+        qs = qs.filter(
+            models.Q(**{f"{field}__{bound}": value}),
+            models.Q(**{f"{field}__{op}": value}) | models.Q(**{f"id__{op}": pk}),
+        )
+
+    prefix = "-" if descending else ""
+    rows = [row async for row in qs.order_by(f"{prefix}{field}", f"{prefix}id")[:page_size + 1]]
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        if isinstance(last, dict):  # .values() rows
+            next_cursor = encode_cursor(order_by, last[field], last["id"])
+        else:
+            next_cursor = encode_cursor(order_by, getattr(last, field), last.id)
+    return items, next_cursor, page_size
+
+
+# Below this many estimated rows the planner estimate is too coarse to show
+# and an exact COUNT(*) is cheap anyway
+EXACT_COUNT_THRESHOLD = 1000
+
+
+# Row count estimated by the PostgreSQL planner for the filtered queryset
+def estimate_count(qs) -> int:
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# Values of the `count` query parameter
+COUNT_STRATEGIES = ("exact", "estimate", "none")
+
+
+# Total for the `count` query parameter: "exact" runs COUNT(*), "estimate" uses the
+# planner's row estimate (falling back to COUNT(*) for small results) and "none" skips it
+async def count_rows(qs, strategy: str):
+    if strategy == "none":
+        return None
+    if strategy == "estimate":
+        estimate = await sync_to_async(estimate_count)(qs)
+        if estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate
+    return await qs.acount()
@@ -0,0 +1,76 @@
+import re
+
+# Currency symbols recognized in free-text salary ranges, longest first so
+# "NT$" is not read as a plain "$"
+CURRENCY_SYMBOLS = {
+    "NT$": "TWD",
+    "US$": "USD",
+    "HK$": "HKD",
+    "S$": "SGD",
+    "$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "₩": "KRW",
+}
+
+# Active ISO 4217 codes; other capitalized words ("DOE", "TBD") are not currencies
+CURRENCY_CODES = frozenset("""
+    AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB BRL
+    BSD BTN BWP BYN BZD CAD CDF CHF CLP CNY COP CRC CUP CVE CZK DJF DKK DOP DZD EGP
+    ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GNF GTQ GYD HKD HNL HTG HUF IDR ILS INR
+    IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW KRW KWD KYD KZT LAK LBP LKR LRD LSL
+    LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN NAD NGN NIO NOK NPR
+    NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD RUB RWF SAR SBD SCR SDG SEK SGD
+    SHP SLE SOS SRD SSP STN SVC SYP SZL THB TJS TMT TND TOP TRY TTD TWD TZS UAH UGX
+    USD UYU UZS VES VND VUV WST XAF XCD XOF XPF YER ZAR ZMW ZWL
+""".split())
+
+# Largest amount the salary_min/salary_max columns (PositiveIntegerField) hold
+MAX_SALARY_AMOUNT = 2_147_483_647
+
+_CURRENCY_CODE = re.compile(r"\b[A-Z]{3}\b")
+_AMOUNT = re.compile(r"(\d+(?:[.,]\d+)*)\s*([kKmM](?![a-zA-Z]))?")
+_GROUPED = re.compile(r"\d{1,3}(?:[.,]\d{3})+")
+_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+
+def _parse_amount(number: str, suffix: str):
+    if _GROUPED.fullmatch(number):
+        value = float(re.sub(r"[.,]", "", number))  # thousands separators
+    else:
+        value = float(number.replace(",", "."))
+    if suffix:
+        value *= _MULTIPLIERS[suffix.lower()]
+    return value
+
+
+# Parse a free-text salary_range such as "80,000 - 120,000 TWD", "NT$50k-70k"
+# or "$120,000" into (salary_min, salary_max, currency). A single amount is both
+# bounds; text without any amount gives (None, None, ""). Amounts are stored as
+# written, the pay period ("/month", "per year") is not normalized.
+def parse_salary_range(text):
+    if not text:
+        return None, None, ""
+
+    currency = ""
+    codes = [code for code in _CURRENCY_CODE.findall(text) if code in CURRENCY_CODES]
+    if codes:
+        currency = codes[0]
+    else:
+        for symbol, symbol_currency in CURRENCY_SYMBOLS.items():
+            if symbol in text:
+                currency = symbol_currency
+                break
+
+    matches = _AMOUNT.findall(text)[:2]
+    if not matches:
+        return None, None, currency
+    amounts = [_parse_amount(number, suffix) for number, suffix in matches]
+    # "50-70k" shares the suffix of the upper bound
+    if len(matches) == 2 and not matches[0][1] and matches[1][1] and amounts[0] < 1000:
+        amounts[0] *= _MULTIPLIERS[matches[1][1].lower()]
+    amounts = [round(amount) for amount in amounts]
+    if max(amounts) > MAX_SALARY_AMOUNT:
+        return None, None, currency
+    return min(amounts), max(amounts), currency
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from datetime import date
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .cache import invalidate_all
+from .changes import prune_tombstones
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key so only one process runs a transition at a time
+# when every web worker starts its own scheduler
+TRANSITION_LOCK_KEY = 0x6A6F6273  # "jobs"
+
+# Totals since process start, readable by metrics endpoints
+stats = {
+    "runs": 0,
+    "skipped_runs": 0,
+    "activated": 0,
+    "expired": 0,
+    "rescheduled": 0,
+    "last_run_at": None,
+    "last_duration_ms": None,
+}
+_stats_lock = threading.Lock()
+
+
+# Bring every stored status in line with its dates using one UPDATE per
+# transition, each driven by the (status, date) / date indexes on jobs_job.
+# Returns the number of rows moved per transition, or None when another
+# process holds the transition lock.
+def transition_job_statuses(today=None):
+    today = today or date.today()
+    now = timezone.now()
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [TRANSITION_LOCK_KEY])
+            if not cursor.fetchone()[0]:
+                with _stats_lock:
+                    stats["skipped_runs"] += 1
+                return None
+
+        # The three steps follow compute_status: a future posting_date wins over
+        # a past expiration_date, so such rows are left to the reschedule step
+        # instead of flipping between expired and scheduled on every run.
+        # active/scheduled -> expired
+        expired = (
+            Job.objects.filter(expiration_date__lt=today, posting_date__lte=today)
+            .exclude(status="expired")
+            .update(status="expired", updated_at=now)
+        )
+        # scheduled -> active
+        activated = (
+            Job.objects.filter(status="scheduled", posting_date__lte=today, expiration_date__gte=today)
+            .update(status="active", updated_at=now)
+        )
+        # Rows whose dates were moved forward without a save, e.g. by raw SQL
+        rescheduled = (
+            Job.objects.filter(posting_date__gt=today)
+            .exclude(status="scheduled")
+            .update(status="scheduled", updated_at=now)
+        )
+
+    result = {"activated": activated, "expired": expired, "rescheduled": rescheduled}
+    if any(result.values()):
+        invalidate_all()
+    duration_ms = (time.perf_counter() - started) * 1000
+    with _stats_lock:
+        stats["runs"] += 1
+        for key, count in result.items():
+            stats[key] += count
+        stats["last_run_at"] = now
+        stats["last_duration_ms"] = duration_ms
+    logger.info(
+        "Job status transition: %d activated, %d expired, %d rescheduled in %.1fms",
+        activated, expired, rescheduled, duration_ms,
+    )
+    return result
+
+
+# In-process periodic runner for deployments without Celery/Redis.
+# Runs transition_job_statuses every `interval` seconds on a daemon thread,
+# pruning expired change feed tombstones along the way.
+class StatusScheduler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="job-status-scheduler", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                transition_job_statuses()
+                prune_tombstones()
+            except Exception:
+                logger.exception("Job status transition failed")
+            finally:
+                connection.close()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def start_scheduler(interval: float):
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = StatusScheduler(interval)
+        _scheduler.start()
+    return _scheduler
+
+
+# Start the in-process runner when JOB_STATUS_SCHEDULER_INTERVAL is set (0 disables
+# it). Only the server entry points (job_platform.asgi / job_platform.wsgi) call
+# this, so migrate, tests and other management commands never start a runner.
+def start_configured_scheduler():
+    if settings.JOB_STATUS_SCHEDULER_INTERVAL > 0:
+        return start_scheduler(settings.JOB_STATUS_SCHEDULER_INTERVAL)
+    return None
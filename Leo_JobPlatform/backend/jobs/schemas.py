@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from ninja import Schema
-from typing import List
+from typing import ClassVar, Dict, List
 from typing import Optional
 
 class JobSchema(Schema):
@@ -10,6 +10,9 @@ class JobSchema(Schema):
     location: str
     description: str
     salary_range: str = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    currency: str = ""
     required_skills: List[str]
     posting_date: datetime
     expiration_date: datetime
@@ -17,6 +20,22 @@ class JobSchema(Schema):
     created_at: datetime
     updated_at: datetime
 
+# Lean listing representation (fields=summary): everything but the description,
+# built straight from .values() rows without model instances or validation
+class JobSummarySchema(Schema):
+    id: int
+    title: str
+    company: str
+    location: str
+    salary_range: str = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    currency: str = ""
+    required_skills: List[str]
+    posting_date: date
+    expiration_date: date
+    status: str
+
 class JobCreateSchema(Schema):
     title: str
     company: str
@@ -27,18 +46,151 @@ class JobCreateSchema(Schema):
     posting_date: datetime
     expiration_date: datetime
 
+# Partial update (PATCH): omitted fields keep their value; company cannot be changed
+class JobPatchSchema(Schema):
+    title: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    salary_range: Optional[str] = None
+    required_skills: Optional[List[str]] = None
+    posting_date: Optional[datetime] = None
+    expiration_date: Optional[datetime] = None
+    # updated_at of the version being edited; the update fails with 412 when the
+    # job changed since (the job's ETag in If-Match works the same way)
+    updated_at: Optional[datetime] = None
+
 class JobQueryParams(Schema):
     search: Optional[str] = None
+    search_mode: Optional[str] = "substring"  # "substring" or "fulltext" (ranked by relevance)
     status: Optional[str] = None
-    location: Optional[str] = None
-    company: Optional[str] = None
-    order_by: Optional[str] = "posting_date"
+    location: Optional[str] = None  # substring of the location name
+    company: Optional[str] = None  # substring of the company name
+    location_id: Optional[int] = None  # exact location (see /locations)
+    company_id: Optional[int] = None  # exact company (see /companies)
+    # Salary filters over the parsed salary_range; jobs without a parsed salary are excluded
+    salary_min: Optional[int] = None  # jobs whose range reaches at least this amount
+    salary_max: Optional[int] = None  # jobs whose range starts at or below this amount
+    currency: Optional[str] = None  # ISO code, e.g. TWD
+    order_by: Optional[str] = "posting_date"  # "posting_date", "expiration_date" or "salary" (highest first)
     page: int = 1
     page_size: int = 10
+    pagination: Optional[str] = "page"  # "page" (page/page_size) or "cursor" (keyset, see next_cursor)
+    cursor: Optional[str] = None  # next_cursor of the previous page, implies pagination=cursor
+    count: Optional[str] = None  # "exact" (page mode default), "estimate" or "none" (cursor mode default)
+    fields: Optional[str] = None  # "summary" (JobSummarySchema) or comma-separated JobSchema fields
+    # Skill filters, repeated (?skills_any=a&skills_any=b) or comma-separated; matched case-sensitively
+    skills_any: Optional[List[str]] = None  # jobs requiring at least one of these skills
+    skills_all: Optional[List[str]] = None  # jobs requiring all of these skills
+    facets: Optional[str] = None  # "true" for all facets, or comma-separated: status,company,location,skills
+
+    # Parameters that take several values from the query string
+    LIST_PARAMS: ClassVar[tuple] = ("skills_any", "skills_all")
+
+# Listing filters plus the export format; pagination parameters are ignored
+class JobExportParams(JobQueryParams):
+    format: str = "ndjson"  # "ndjson" or "csv"
+
+class FacetCount(Schema):
+    value: str
+    count: int
 
 class PaginatedResponse(Schema):
     items: List[JobSchema]
-    total: int
-    page: int
+    total: Optional[int] = None  # null when count=none
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: Optional[int] = None
+    has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None  # opaque cursor of the next page, null on the last page
+    facets: Optional[Dict[str, List[FacetCount]]] = None  # facet name -> top values with counts
+
+class JobChangesParams(Schema):
+    cursor: Optional[str] = None  # next_cursor of the previous call (or an event id)
+    since: Optional[datetime] = None  # start from this time instead of a cursor; neither starts from the beginning
+    limit: int = 100
+    stream: bool = False  # push the changes as server-sent events (also with Accept: text/event-stream)
+
+class JobChangeSchema(Schema):
+    op: str  # "create", "update", "delete" or "archive" (left the listings, still readable by id)
+    id: int
+    changed_at: datetime
+    job: Optional[JobSchema] = None  # the job's current state; null for deletes
+    cursor: str  # position right after this change
+
+class JobChangesResponse(Schema):
+    changes: List[JobChangeSchema]
+    next_cursor: Optional[str] = None  # where the next call resumes; null only before the first change
+    has_more: bool  # more settled changes are waiting, call again right away
+
+class JobMatchQueryParams(Schema):
+    skills: List[str]  # candidate skills, repeated or comma-separated
+    status: Optional[str] = "active"
+    limit: int = 10
+
+    LIST_PARAMS: ClassVar[tuple] = ("skills",)
+
+class JobMatchSchema(JobSummarySchema):
+    score: int  # number of the candidate's skills the job requires
+    matched_skills: List[str]
+
+class JobMatchResponse(Schema):
+    items: List[JobMatchSchema]
+
+class JobSimilarParams(Schema):
+    status: Optional[str] = "active"  # status of the similar jobs returned, empty for any
+    limit: int = 10
+
+class JobSimilarSchema(JobSummarySchema):
+    score: float  # Jaccard similarity of the skills, title words and location (0-1)
+    shared_skills: List[str]  # skills both jobs require (case-insensitive)
+
+class JobSimilarResponse(Schema):
+    items: List[JobSimilarSchema]
+
+class BulkRowError(Schema):
+    row: int  # 0-based position of the row in the request body
+    error: str
+
+class BulkCreateResponse(Schema):
+    created: int
+    errors: List[BulkRowError]
+
+# Jobs selected by a bulk update/delete: the listed ids and/or the jobs matching
+# the list_jobs filters (pagination, ordering and facet parameters are ignored).
+# Both are combined when given; at least one is required.
+class JobBulkSelector(Schema):
+    ids: Optional[List[int]] = None
+    filters: Optional[JobQueryParams] = None
+
+# Values set on every selected job; omitted fields are left unchanged.
+# company cannot be changed, as in update_job.
+class JobBulkChanges(Schema):
+    title: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    salary_range: Optional[str] = None
+    required_skills: Optional[List[str]] = None
+    posting_date: Optional[date] = None
+    expiration_date: Optional[date] = None
+    expire: bool = False  # end the postings today (expiration_date = yesterday unless already earlier)
+
+class JobBulkUpdateSchema(JobBulkSelector):
+    changes: JobBulkChanges
+
+class BulkUpdateResponse(Schema):
+    updated: int
+
+class BulkDeleteResponse(Schema):
+    deleted: int
+
+# A company or location name with the key the job filters accept (company_id, location_id)
+class LookupNameSchema(Schema):
+    id: int
+    name: str
+
+class LookupNameParams(Schema):
+    name: str  # exact name
+
+class LookupAutocompleteParams(Schema):
+    prefix: str  # case-insensitive name prefix
+    limit: int = 10
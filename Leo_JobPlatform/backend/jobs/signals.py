@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_job
+from .models import Job
+
+
+# Keep cached job responses in sync with every ORM write (create_job,
+# update_job, delete_job, admin, shell); bulk paths invalidate explicitly
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    invalidate_job(instance.pk)
@@ -0,0 +1,82 @@
+from django.db import connections, models, router
+from django.contrib.postgres.fields import ArrayField
+from .models import Job, JobSimilarityBucket
+
+# Similar jobs: candidates are the jobs sharing a MinHash/LSH bucket with the job
+# (jobs_jobsimilaritybucket, kept current by triggers on jobs_job), ranked by the
+# exact Jaccard similarity of their features. The features and buckets are
+# computed by the jobs_similarity_features/jobs_similarity_buckets SQL functions
+# (migration 0011), so every write path and this lookup agree on them.
+
+MAX_SIMILAR_LIMIT = 50
+
+# Newest jobs read per bucket. Popular buckets (a common title with common skills)
+# can hold many thousands of jobs; reading a bounded slice of each keeps a lookup
+# at 9 index range scans (one per bucket) and at most 9 x SIMILAR_BUCKET_SIZE rows.
+SIMILAR_BUCKET_SIZE = 50
+
+# Candidates scored exactly per requested result: those sharing the most buckets
+# with the job, the best estimate of their similarity before reading their rows
+SIMILAR_CANDIDATES_PER_RESULT = 5
+
+CANDIDATES_SQL = f"""
+    SELECT jobs_similarity_features(%s, %s::varchar[], %s), ARRAY(
+        SELECT candidate.job_id
+        FROM unnest(jobs_similarity_buckets(%s, %s::varchar[], %s)) AS target (bucket)
+        CROSS JOIN LATERAL (
+            SELECT job_id FROM {JobSimilarityBucket._meta.db_table}
+            WHERE bucket = target.bucket AND job_id <> %s
+            ORDER BY job_id DESC
+            LIMIT %s
+        ) AS candidate
+        JOIN {Job._meta.db_table} AS job ON job.id = candidate.job_id
+        WHERE %s = '' OR job.status = %s
+        GROUP BY candidate.job_id
+        ORDER BY count(*) DESC, candidate.job_id DESC
+        LIMIT %s
+    )
+"""
+
+
+def similarity_features():
+    return models.Func(
+        models.F("title"), models.F("required_skills"), models.F("location_ref_id"),
+        function="jobs_similarity_features", output_field=ArrayField(models.TextField()),
+    )
+
+
+def jaccard(a: set, b: set) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+# Features of `job` (live or archived) and the ids of up to `count` candidates
+# with `status` (any when empty), in one query
+def find_candidates(job, count: int, status: str = "", bucket_size: int = SIMILAR_BUCKET_SIZE):
+    signature = (job.title, job.required_skills, job.location_ref_id)
+    with connections[router.db_for_read(Job)].cursor() as cursor:
+        cursor.execute(CANDIDATES_SQL, (*signature, *signature, job.id, bucket_size, status, status, count))
+        features, candidate_ids = cursor.fetchone()
+    return set(features), candidate_ids
+
+
+# Top `limit` live jobs most similar to `job` by skills, title words and location,
+# as JobSummarySchema rows with their score (0-1) and the skills both require
+def similar_jobs(job, fields, limit: int = 10, status: str = None):
+    limit = min(max(limit, 1), MAX_SIMILAR_LIMIT)
+    status = (status or "").strip().lower()
+    features, candidate_ids = find_candidates(job, limit * SIMILAR_CANDIDATES_PER_RESULT, status)
+    if not candidate_ids:
+        return {"items": []}
+
+    rows = Job.objects.filter(id__in=candidate_ids).annotate(features=similarity_features()).values_with_names(*fields, "features")
+
+    skills = {skill.lower() for skill in job.required_skills}
+    items = []
+    for row in rows:
+        score = jaccard(features, set(row.pop("features")))
+        shared = [skill for skill in row["required_skills"] if skill.lower() in skills]
+        items.append({**row, "score": round(score, 4), "shared_skills": shared})
+    # Ties go to the newest posting
+    items.sort(key=lambda item: (item["score"], item["posting_date"], item["id"]), reverse=True)
+    return {"items": items[:limit]}
@@ -0,0 +1,262 @@
+import multiprocessing
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+import django
+from django.db import connection, connections, transaction
+from .cache import invalidate_listings
+from .ingest import BULK_BATCH_SIZE, write_batch
+from .models import DeferredIndex, Job, compute_status
+from .salary import parse_salary_range
+
+# Synthetic job postings for benchmarks and staging data. Every row is drawn
+# from its own (seed, number) random stream, so a data set is the same however
+# the work is split into batches or processes.
+
+# Job titles with the skills they usually ask for
+TITLE_SKILLS = {
+    "Senior Python Developer": ["Python", "Django", "Flask", "PostgreSQL", "REST API", "Docker", "AWS", "Git"],
+    "Frontend Developer": ["JavaScript", "TypeScript", "React", "Vue", "Angular", "CSS", "Git", "GraphQL"],
+    "Backend Developer": ["Python", "Java", "Node.js", "Spring Boot", "PostgreSQL", "MongoDB", "REST API", "Microservices"],
+    "Full Stack Developer": ["JavaScript", "TypeScript", "React", "Node.js", "Python", "Django", "PostgreSQL", "Docker"],
+    "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "Azure", "GCP", "CI/CD", "Terraform", "Linux"],
+    "Data Scientist": ["Python", "SQL", "Pandas", "Machine Learning", "Statistics", "Spark", "TensorFlow"],
+    "Machine Learning Engineer": ["Python", "PyTorch", "TensorFlow", "Machine Learning", "Kubernetes", "GCP", "Spark"],
+    "Mobile Developer": ["Swift", "Kotlin", "React Native", "Flutter", "Git", "REST API", "Firebase"],
+    "UI/UX Designer": ["Figma", "Sketch", "User Research", "Prototyping", "CSS", "Design Systems"],
+    "Product Manager": ["Roadmapping", "Agile", "Scrum", "Analytics", "SQL", "User Research"],
+}
+SENIORITY = ["", "", "", "Junior ", "Senior ", "Lead ", "Staff "]
+
+# Locations weighted roughly by how many postings they attract
+LOCATIONS = {
+    "Taipei, Taiwan": 40,
+    "New Taipei, Taiwan": 15,
+    "Hsinchu, Taiwan": 15,
+    "Taichung, Taiwan": 12,
+    "Kaohsiung, Taiwan": 8,
+    "Tainan, Taiwan": 5,
+    "Remote": 5,
+}
+
+COMPANY_PREFIXES = [
+    "Tech", "Digital", "Future", "Smart", "Global", "Innovative", "Cloud", "Data", "Quantum", "Blue",
+    "Bright", "Next", "Open", "Prime", "Silver", "Urban", "Vertex", "Nova", "Apex", "Pixel",
+]
+COMPANY_SUFFIXES = [
+    "Solutions", "Innovations", "Systems", "Software", "Pioneers", "Dynamics", "Technologies", "Labs",
+    "Works", "Networks", "Studios", "Analytics", "Ventures", "Partners", "Logic",
+]
+# Company -> weight; a few large employers post most of the jobs (Zipf-like)
+COMPANIES = {
+    f"{prefix} {suffix}": 1 / rank
+    for rank, (prefix, suffix) in enumerate(
+        ((p, s) for s in COMPANY_SUFFIXES for p in COMPANY_PREFIXES), start=1
+    )
+}
+
+# Monthly salary bands in TWD, with some postings not disclosing a salary
+SALARY_BANDS = [(40, 60), (50, 80), (60, 90), (80, 120), (100, 150), (120, 180), (150, 220)]
+UNDISCLOSED_SALARY = ["", "Negotiable", "Competitive"]
+
+SENTENCES = [
+    "You will work closely with product and design to ship features end to end.",
+    "We value clean code, automated testing and thoughtful code review.",
+    "The team owns its services from design through production operations.",
+    "Experience with high-traffic systems is a plus.",
+    "We offer flexible hours, remote days and a yearly learning budget.",
+    "You will mentor other engineers and help shape our technical roadmap.",
+    "Our stack runs on containers and managed cloud services.",
+    "Strong communication skills in English or Mandarin are expected.",
+]
+
+_TITLES = list(TITLE_SKILLS)
+_COMPANY_NAMES = list(COMPANIES)
+_COMPANY_WEIGHTS = list(COMPANIES.values())
+_LOCATION_NAMES = list(LOCATIONS)
+_LOCATION_WEIGHTS = list(LOCATIONS.values())
+
+
+# Build `count` unsaved jobs numbered from `offset`, with status and salary columns
+# precomputed the way Job.save would, ready for bulk_create/COPY
+def generate_jobs(count: int, seed: int = 0, offset: int = 0, today: date = None):
+    today = today or date.today()
+    jobs = []
+    for number in range(offset + 1, offset + count + 1):
+        rng = random.Random(f"{seed}:{number}")
+        title = rng.choice(_TITLES)
+        pool = TITLE_SKILLS[title]
+        skills = rng.sample(pool, rng.randint(2, min(5, len(pool))))
+        company = rng.choices(_COMPANY_NAMES, _COMPANY_WEIGHTS)[0]
+
+        # Most postings are recent; a tail is old enough to have expired
+        posting_date = today - timedelta(days=int(rng.expovariate(1 / 45)) - 14)
+        expiration_date = posting_date + timedelta(days=rng.choice([30, 45, 60, 90]))
+
+        if rng.random() < 0.15:
+            salary_range = rng.choice(UNDISCLOSED_SALARY)
+        else:
+            low, high = rng.choice(SALARY_BANDS)
+            salary_range = f"{low},000 - {high},000 TWD"
+        salary_min, salary_max, currency = parse_salary_range(salary_range)
+
+        description = (
+            f"{company} is hiring a {title} (posting #{number}). "
+            f"Required skills: {', '.join(skills)}. "
+            + " ".join(rng.sample(SENTENCES, 3))
+        )
+        jobs.append(Job(
+            title=rng.choice(SENIORITY) + title if not title.startswith("Senior") else title,
+            company=company,
+            location=rng.choices(_LOCATION_NAMES, _LOCATION_WEIGHTS)[0],
+            description=description,
+            salary_range=salary_range,
+            salary_min=salary_min,
+            salary_max=salary_max,
+            currency=currency,
+            required_skills=skills,
+            posting_date=posting_date,
+            expiration_date=expiration_date,
+            status=compute_status(posting_date, expiration_date, today),
+        ))
+    return jobs
+
+
+# Split rows [offset, offset + count) into (offset, size) batches
+def iter_batches(count: int, offset: int = 0, batch_size: int = BULK_BATCH_SIZE):
+    for start in range(offset, offset + count, batch_size):
+        yield start, min(batch_size, offset + count - start)
+
+
+# Write one generated batch through the bulk ingest write path (COPY on PostgreSQL)
+def load_batch(offset: int, size: int, seed: int = 0) -> int:
+    errors = []
+    created = write_batch(list(enumerate(generate_jobs(size, seed, offset))), errors)
+    if errors:
+        raise RuntimeError(f"Failed to load generated jobs: {errors[0]['error']}")
+    return created
+
+
+# Generated rows can be rebuilt from their seed, so a crash losing the last
+# commits is acceptable in exchange for not waiting on every WAL flush
+def relax_durability():
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET synchronous_commit TO OFF")
+
+
+def restore_durability():
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("RESET synchronous_commit")
+
+
+# Insert `count` generated jobs numbered from `offset` in batches of `batch_size`.
+# `progress` is called with the running total after each batch.
+def load_jobs(count: int, seed: int = 0, offset: int = 0, batch_size: int = BULK_BATCH_SIZE,
+              progress=None):
+    relax_durability()
+    created = 0
+    try:
+        for start, size in iter_batches(count, offset, batch_size):
+            created += load_batch(start, size, seed)
+            if progress:
+                progress(created)
+    finally:
+        restore_durability()
+    if created:
+        invalidate_listings()
+    return created
+
+
+# Runs in the spawned workers, set up by django.setup (the pool initializer, as
+# unpickling anything from this module needs the app registry already loaded)
+def _load_batch(args):
+    relax_durability()
+    return load_batch(*args)
+
+
+# load_jobs spread over `workers` processes, each generating and writing whole
+# batches on its own connection. The rows are identical to a single-process load.
+def load_jobs_parallel(count: int, seed: int = 0, offset: int = 0, batch_size: int = BULK_BATCH_SIZE,
+                       workers: int = 2, progress=None):
+    if workers <= 1:
+        return load_jobs(count, seed, offset, batch_size, progress)
+
+    connections.close_all()
+    tasks = [(start, size, seed) for start, size in iter_batches(count, offset, batch_size)]
+    created = 0
+    # Spawned rather than forked, so no worker inherits the parent's connections
+    # (or the sockets held by its connection pool); each opens its own
+    with multiprocessing.get_context("spawn").Pool(workers, initializer=django.setup) as pool:
+        for written in pool.imap_unordered(_load_batch, tasks):
+            created += written
+            if progress:
+                progress(created)
+    if created:
+        invalidate_listings()
+    return created
+
+
+# Drop the secondary indexes of jobs_job for the duration of a large load and
+# rebuild them afterwards: one sorted build per index is far cheaper than
+# maintaining every trigram/GIN index row by row. Constraint indexes are kept.
+# Each definition is recorded as a DeferredIndex in the transaction that drops
+# it, so a load that is killed before the rebuild can be recovered with
+# restore_deferred_indexes; leftovers of such a load are rebuilt first.
+@contextmanager
+def deferred_indexes(log=None):
+    if connection.vendor != "postgresql":
+        yield
+        return
+    restore_deferred_indexes(log)
+    table = Job._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = %s
+              AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)
+            """,
+            [table, table],
+        )
+        indexes = cursor.fetchall()
+        DeferredIndex.objects.bulk_create(
+            [DeferredIndex(name=name, definition=definition) for name, definition in indexes]
+        )
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    try:
+        yield
+    finally:
+        restore_deferred_indexes(log)
+
+
+# Rebuild the indexes recorded by deferred_indexes, each in its own transaction
+# together with the removal of its record (indexes recreated by hand meanwhile
+# are skipped). Returns the number of records processed.
+def restore_deferred_indexes(log=None) -> int:
+    pending = list(DeferredIndex.objects.order_by("id"))
+    if not pending:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("SET maintenance_work_mem TO '512MB'")
+        for index in pending:
+            if log:
+                log(f"Rebuilding {index.name}")
+            with transaction.atomic():
+                cursor.execute(
+                    "SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = %s",
+                    [index.name],
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute(index.definition)
+                index.delete()
+        cursor.execute("RESET maintenance_work_mem")
+    return len(pending)
+
+
+# Refresh planner statistics after a large load so benchmarks see realistic plans
+def analyze_jobs():
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Job._meta.db_table}")
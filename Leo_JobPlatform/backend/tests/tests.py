@@ -1,7 +1,20 @@
-from django.test import TestCase
-from django.test import Client
+from django.test import TestCase, override_settings
+from django.test import AsyncClient, Client
 from datetime import date, timedelta
-from jobs.models import Job
+from django.conf import settings
+from django.db import connection, router
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+import tempfile
+from job_platform.db_router import read_replica, reads_from_replica
+from jobs.apis import build_search_query
+from jobs.facets import compute_facets
+from jobs.testdata import deferred_indexes, generate_jobs
+from jobs.scheduler import transition_job_statuses
+from jobs import cache as job_cache
+from jobs.models import Company, DeferredIndex, Job, JobArchive, JobSimilarityBucket, Location, compute_status
+from jobs.salary import parse_salary_range
 import json
 import warnings
 import pytest
@@ -14,6 +27,11 @@ def ignore_warnings():
     warnings.filterwarnings('ignore', category=RuntimeWarning)
     warnings.filterwarnings('ignore', category=FutureWarning)
 
+# A per-process cache, so entries never outlive the test database they were built from
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'job-platform-tests'}},
+    JOBS_CACHE_TIMEOUT=300,
+)
 class JobAPITestCase(TestCase):
     def setUp(self):
         self.client = Client()
@@ -88,6 +106,74 @@ class JobAPITestCase(TestCase):
         self.assertEqual(len(data['items']), 1)
         self.assertEqual(data['items'][0]['company'], "Tech Corp")
 
+    def test_list_jobs_search_is_literal(self):
+        # LIKE wildcards in the search term must be matched literally
+        response = self.client.get('/api/jobs?search=%25')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 0)
+
+        response = self.client.get('/api/jobs?search=python')
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 1)  # search stays case-insensitive
+
+    def test_list_jobs_fulltext_search(self):
+        # A title match should rank above a description-only match
+        Job.objects.create(
+            title="Site Reliability Lead",
+            company="Ops Inc",
+            location="Taipei, Taiwan",
+            description="Work closely with every engineer on call",
+            salary_range="",
+            required_skills=["Linux"],
+            posting_date=date.today() - timedelta(days=10),
+            expiration_date=date.today() + timedelta(days=20)
+        )
+        response = self.client.get('/api/jobs?search=engineers&search_mode=fulltext')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 2)  # stemming matches "engineer"
+        self.assertEqual(data['items'][0]['title'], "DevOps Engineer")
+        self.assertEqual(data['items'][1]['title'], "Site Reliability Lead")
+
+        # Skills are searchable and the vector follows updates
+        response = self.client.get('/api/jobs?search=kubernetes&search_mode=fulltext')
+        self.assertEqual(json.loads(response.content)['total'], 1)
+        self.job3.required_skills = ["Terraform"]
+        self.job3.save()
+        response = self.client.get('/api/jobs?search=kubernetes&search_mode=fulltext')
+        self.assertEqual(json.loads(response.content)['total'], 0)
+
+    def test_search_uses_trigram_index(self):
+        # The search predicate must be answerable from the pg_trgm GIN indexes, with
+        # company names matched in jobs_company and probed by key ("Tech Corp", "Cloud Tech")
+        qs = Job.objects.filter(build_search_query("Tech")).order_by().values("id")
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("job_title_trgm_idx", plan)
+        self.assertIn("job_description_trgm_idx", plan)
+        self.assertIn("job_company_idx", plan)
+        self.assertEqual({job["id"] for job in qs}, {self.job1.id, self.job3.id})
+
+    def test_active_listing_uses_index_order(self):
+        # "Active jobs, newest first" must be read in index order without a sort step
+        qs = Job.objects.filter(status="active").order_by("-posting_date", "-id")[:10]
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("job_active_posting_idx", plan)
+        self.assertNotIn("Sort", plan)
+
+        # Status matching stays case-insensitive for clients
+        response = self.client.get('/api/jobs?status=Scheduled')
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 1)
+
     def test_list_jobs_with_ordering(self):
         # Test sorting by posting date
         response = self.client.get('/api/jobs?order_by=posting_date')
@@ -132,6 +218,196 @@ class JobAPITestCase(TestCase):
         self.assertEqual(data['page'], 2)
         self.assertEqual(data['total_pages'], 2)
 
+    def test_list_jobs_with_cursor_pagination(self):
+        for i in range(15):  # create 15 more jobs sharing the same dates
+            Job.objects.create(
+                title=f"Test Job {i}",
+                company=f"Test Company {i}",
+                location="Taipei, Taiwan",
+                description=f"Test description {i}",
+                salary_range="50,000 - 70,000 TWD",
+                required_skills=["Test"],
+                posting_date=date.today(),
+                expiration_date=date.today() + timedelta(days=30)
+            )
+
+        for order_by in ("posting_date", "expiration_date"):
+            # Walk all pages and compare against the offset-based listing
+            expected = json.loads(self.client.get(f'/api/jobs?order_by={order_by}&page_size=0').content)
+            seen = []
+            url = f'/api/jobs?pagination=cursor&order_by={order_by}&page_size=4'
+            while True:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                data = json.loads(response.content)
+                self.assertIsNone(data['total'])  # cursor mode skips the COUNT(*)
+                seen.extend(item['id'] for item in data['items'])
+                if not data['next_cursor']:
+                    break
+                url = f'/api/jobs?order_by={order_by}&page_size=4&cursor={data["next_cursor"]}'
+            self.assertEqual(seen, [item['id'] for item in expected['items']])
+
+    def test_list_jobs_with_invalid_cursor(self):
+        response = self.client.get('/api/jobs?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+        # A cursor is only valid for the ordering it was issued for
+        data = json.loads(self.client.get('/api/jobs?pagination=cursor&page_size=1').content)
+        response = self.client.get(f'/api/jobs?order_by=expiration_date&cursor={data["next_cursor"]}')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_jobs_count_strategies(self):
+        # count=none skips COUNT(*) and reports has_next from an extra row
+        response = self.client.get('/api/jobs?count=none&page_size=2')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIsNone(data['total'])
+        self.assertIsNone(data['total_pages'])
+        self.assertEqual(len(data['items']), 2)
+        self.assertTrue(data['has_next'])
+
+        data = json.loads(self.client.get('/api/jobs?count=none&page=2&page_size=2').content)
+        self.assertEqual(len(data['items']), 1)
+        self.assertFalse(data['has_next'])
+
+        # Small estimates fall back to an exact count
+        data = json.loads(self.client.get('/api/jobs?count=estimate&page_size=2').content)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['total_pages'], 2)
+
+        # Cursor mode can opt into a total
+        data = json.loads(self.client.get('/api/jobs?pagination=cursor&count=exact').content)
+        self.assertEqual(data['total'], 3)
+
+        # Unknown strategies are rejected rather than falling back to a default
+        self.assertEqual(self.client.get('/api/jobs?count=extact').status_code, 400)
+
+    def test_list_jobs_with_field_projection(self):
+        response = self.client.get('/api/jobs?fields=summary')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 3)
+        item = data['items'][0]
+        self.assertNotIn('description', item)
+        self.assertEqual(item['title'], "Senior Python Developer")
+        self.assertEqual(item['posting_date'], (date.today() + timedelta(days=1)).isoformat())
+
+        data = json.loads(self.client.get('/api/jobs?fields=title,status&status=active').content)
+        self.assertEqual(data['items'], [{"id": self.job2.id, "title": "Frontend Developer", "status": "active"}])
+
+        # Projections combine with cursor pagination and ranked search
+        data = json.loads(self.client.get('/api/jobs?fields=summary&pagination=cursor&page_size=2').content)
+        self.assertEqual(len(data['items']), 2)
+        data = json.loads(self.client.get(f'/api/jobs?fields=title&cursor={data["next_cursor"]}').content)
+        self.assertEqual(data['items'], [{"id": self.job3.id, "title": "DevOps Engineer"}])
+        data = json.loads(self.client.get('/api/jobs?fields=title&search=devops&search_mode=fulltext').content)
+        self.assertEqual(data['items'], [{"id": self.job3.id, "title": "DevOps Engineer"}])
+
+        response = self.client.get('/api/jobs?fields=title,password')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_jobs_with_skill_filters(self):
+        response = self.client.get('/api/jobs?skills_any=Python&skills_any=React')
+        data = json.loads(response.content)
+        self.assertEqual({item['id'] for item in data['items']}, {self.job1.id, self.job2.id})
+
+        # Comma-separated values work too
+        data = json.loads(self.client.get('/api/jobs?skills_all=Python,Django').content)
+        self.assertEqual([item['id'] for item in data['items']], [self.job1.id])
+        data = json.loads(self.client.get('/api/jobs?skills_all=Python,React').content)
+        self.assertEqual(data['total'], 0)
+
+        # Conditional validators see every value of a repeated parameter
+        etag = self.client.get('/api/jobs?skills_any=Python&skills_any=React')['ETag']
+        self.assertNotEqual(etag, self.client.get('/api/jobs?skills_any=Python')['ETag'])
+
+    def test_skill_filter_uses_gin_index(self):
+        qs = Job.objects.filter(required_skills__overlap=["Python"]).order_by()
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("job_skills_gin_idx", plan)
+
+    def test_match_jobs_by_skills(self):
+        Job.objects.create(
+            title="Python Platform Engineer",
+            company="Cloud Tech",
+            location="Taipei, Taiwan",
+            description="Platform team...",
+            salary_range="",
+            required_skills=["Python", "Docker", "Kubernetes", "AWS", "Go"],
+            posting_date=date.today(),
+            expiration_date=date.today() + timedelta(days=30)
+        )
+        response = self.client.get('/api/jobs/match?skills=Python,Docker&skills=Kubernetes&status=')
+        self.assertEqual(response.status_code, 200)
+        items = json.loads(response.content)['items']
+        self.assertEqual(
+            [(item['title'], item['score']) for item in items],
+            [("Python Platform Engineer", 3), ("DevOps Engineer", 2), ("Senior Python Developer", 1)]
+        )
+        self.assertEqual(items[1]['matched_skills'], ["Docker", "Kubernetes"])
+        self.assertNotIn('description', items[0])
+
+        # Jobs requiring every skill are found without scoring; status defaults to active
+        items = json.loads(self.client.get('/api/jobs/match?skills=Python&limit=1').content)['items']
+        self.assertEqual([item['title'] for item in items], ["Python Platform Engineer"])
+
+        response = self.client.get('/api/jobs/match?skills=,')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_jobs_with_facets(self):
+        response = self.client.get('/api/jobs?location=Taipei&facets=true&page_size=1')
+        self.assertEqual(response.status_code, 200)
+        facets = json.loads(response.content)['facets']
+        self.assertEqual(
+            facets['status'], [{"value": "expired", "count": 1}, {"value": "scheduled", "count": 1}]
+        )
+        self.assertEqual(facets['location'], [{"value": "Taipei, Taiwan", "count": 2}])
+        self.assertEqual(len(facets['skills']), 6)
+
+        # Only the requested facets are computed, in a single query
+        with self.assertNumQueries(1):
+            facets = compute_facets(Job.objects.all(), ["company", "skills"])
+        self.assertEqual(set(facets), {"company", "skills"})
+        self.assertIsNone(json.loads(self.client.get('/api/jobs').content)['facets'])
+
+        response = self.client.get('/api/jobs?facets=salary')
+        self.assertEqual(response.status_code, 400)
+
+    def test_parse_salary_range(self):
+        # A shared suffix scales the lower bound before it is rounded
+        self.assertEqual(parse_salary_range("2.5-3.5k USD"), (2500, 3500, "USD"))
+        # Capitalized words that are not ISO 4217 codes are no currency
+        self.assertEqual(parse_salary_range("Salary DOE"), (None, None, ""))
+        self.assertEqual(parse_salary_range("TBD, 50k NT$"), (50000, 50000, "TWD"))
+        # Amounts the columns cannot hold are left out
+        self.assertEqual(parse_salary_range("3,000,000,000 USD"), (None, None, "USD"))
+
+    def test_list_jobs_with_salary_filters(self):
+        self.assertEqual((self.job1.salary_min, self.job1.salary_max, self.job1.currency), (80000, 120000, "TWD"))
+
+        data = json.loads(self.client.get('/api/jobs?order_by=salary').content)
+        self.assertEqual([item['id'] for item in data['items']], [self.job3.id, self.job1.id, self.job2.id])
+        data = json.loads(self.client.get('/api/jobs?salary_min=100000&salary_max=85000&currency=twd').content)
+        self.assertEqual([item['id'] for item in data['items']], [self.job1.id])
+
+        # Updates re-parse the range; text without an amount sorts last
+        self.client.put(f'/api/jobs/{self.job3.id}', {
+            "title": "DevOps Engineer", "company": "Cloud Tech", "location": "Taipei, Taiwan",
+            "description": "DevOps engineer needed...", "salary_range": "Negotiable",
+            "required_skills": ["Docker"], "posting_date": str(date.today()),
+            "expiration_date": str(date.today() + timedelta(days=30)),
+        }, content_type='application/json')
+        data = json.loads(self.client.get('/api/jobs?order_by=salary').content)
+        self.assertEqual(data['items'][-1]['id'], self.job3.id)
+        self.assertIsNone(data['items'][-1]['salary_max'])
+
+        response = self.client.get('/api/jobs?order_by=salary&pagination=cursor')
+        self.assertEqual(response.status_code, 400)
+
     def test_list_jobs_with_invalid_page(self):
         # Test handling of invalid page number
         response = self.client.get('/api/jobs?page=999')
@@ -157,6 +433,180 @@ class JobAPITestCase(TestCase):
         data = json.loads(response.content)
         self.assertEqual(len(data['items']), 3)  # should return all jobs, using default sorting
 
+    def test_transition_job_statuses(self):
+        # Stored statuses go stale as dates pass; fake that with a bulk update
+        Job.objects.update(status="scheduled")
+        result = transition_job_statuses()
+        self.assertEqual(result, {"activated": 1, "expired": 1, "rescheduled": 0})
+        self.assertEqual(Job.objects.get(id=self.job1.id).status, "scheduled")
+        self.assertEqual(Job.objects.get(id=self.job2.id).status, "active")
+        self.assertEqual(Job.objects.get(id=self.job3.id).status, "expired")
+
+        # A week later the scheduled job is live and the today-posted one is still active
+        result = transition_job_statuses(today=date.today() + timedelta(days=7))
+        self.assertEqual(result, {"activated": 1, "expired": 0, "rescheduled": 0})
+
+        # Back to today: the activated job is scheduled again
+        out = StringIO()
+        call_command('update_job_status', stdout=out)
+        self.assertIn("rescheduled 1", out.getvalue())
+        self.assertEqual(Job.objects.get(id=self.job1.id).status, "scheduled")
+
+    def test_transition_job_statuses_is_stable(self):
+        # A future posting date outranks a past expiration date (compute_status)
+        Job.objects.filter(id=self.job1.id).update(
+            status="active", expiration_date=date.today() - timedelta(days=1)
+        )
+        self.assertEqual(transition_job_statuses(), {"activated": 0, "expired": 0, "rescheduled": 1})
+        self.assertEqual(Job.objects.get(id=self.job1.id).status, "scheduled")
+        # Once in line with their dates, no row moves again
+        self.assertEqual(transition_job_statuses(), {"activated": 0, "expired": 0, "rescheduled": 0})
+
+    def test_benchmark_search_command(self):
+        # The synthetic jobs come from --seed, are counted by --count and never kept
+        out = StringIO()
+        call_command('benchmark_search', count=50, seed=1, iterations=1, terms=['Engineer'], stdout=out)
+        self.assertIn("Seeded 50 synthetic jobs (seed 1)", out.getvalue())
+        self.assertIn("'Engineer' [trigram]", out.getvalue())
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_benchmark_api_command(self):
+        # The generator is reproducible however the rows are batched
+        self.assertEqual(
+            [job.description for job in generate_jobs(5, seed=1, offset=2)],
+            [job.description for job in generate_jobs(10, seed=1)[2:7]],
+        )
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'benchmark_api', jobs=20, iterations=3, warmup=1, output=output.name,
+                scenarios=['list_default', 'list_deep_cursor', 'get_job', 'create_job', 'delete_job'],
+                stdout=StringIO(),
+            )
+            report = json.load(open(output.name))
+        self.assertEqual(report['meta']['jobs'], 20)
+        self.assertEqual(report['scenarios']['get_job']['errors'], 0)
+        self.assertEqual(report['scenarios']['get_job']['queries_per_request'], 2)
+        self.assertLessEqual(report['scenarios']['list_default']['p50_ms'], report['scenarios']['list_default']['p99_ms'])
+        # Rows created by the write scenarios are cleaned up
+        self.assertEqual(Job.objects.count(), 20)
+
+    def test_generate_test_data_command(self):
+        out = StringIO()
+        call_command('generate_test_data', count=30, batch_size=7, seed=3, stdout=out)
+        self.assertIn("Successfully created 30 jobs", out.getvalue())
+        generated = Job.objects.exclude(id__in=[self.job1.id, self.job2.id, self.job3.id])
+        self.assertEqual(generated.count(), 30)
+        # Status and salary columns are precomputed like Job.save would
+        for job in generated:
+            self.assertEqual(job.status, compute_status(job.posting_date, job.expiration_date))
+            self.assertEqual((job.salary_min, job.salary_max, job.currency), parse_salary_range(job.salary_range))
+        # Numbering continues after the existing rows
+        self.assertTrue(generated.filter(description__contains="(posting #4)").exists())
+
+    def test_deferred_indexes_recovery(self):
+        # Index DDL needs the deferred FK checks of setUp's inserts out of the way
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        def index_names():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'jobs_job'")
+                return {name for name, in cursor.fetchall()}
+        before = index_names()
+
+        # A load killed inside the block never reaches its rebuild
+        loading = deferred_indexes()
+        loading.__enter__()
+        self.assertNotIn('job_status_posting_idx', index_names())
+        self.assertIn('job_status_posting_idx', DeferredIndex.objects.values_list('name', flat=True))
+
+        out = StringIO()
+        call_command('generate_test_data', restore_indexes=True, stdout=out)
+        self.assertEqual(index_names(), before)
+        self.assertFalse(DeferredIndex.objects.exists())
+        loading.gen.close()  # its own rebuild then finds nothing left to do
+
+    def test_request_instrumentation(self):
+        response = self.client.get(f'/api/jobs/{self.job1.id}')
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+, total;dur=[\d.]+')
+
+        metrics = self.client.get('/metrics')
+        self.assertEqual(metrics.status_code, 200)
+        body = metrics.content.decode()
+        # Detail requests share one series per route, not one per id
+        self.assertIn('http_requests_total{endpoint="/api/jobs/<job_id>",method="GET",status="200"}', body)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="/api/jobs/<job_id>",method="GET",le="+Inf"}', body)
+        self.assertIn('db_queries_total{endpoint="/api/jobs/<job_id>",method="GET"}', body)
+        self.assertIn('jobs_cache_requests_total{kind="detail",result="miss"}', body)
+
+        # Only local clients, or others presenting the token
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 403)
+        with self.settings(METRICS_TOKEN='secret', METRICS_ALLOWED_IPS=['10.0.0.0/8']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code, 200)
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+        # Slow SELECTs are logged with their plan
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0, JOBS_CACHE_TIMEOUT=0):
+            with self.assertLogs('job_platform.instrumentation', 'WARNING') as logs:
+                self.client.get('/api/jobs?status=active')
+        self.assertTrue(any("Slow query" in line and "Scan" in line for line in logs.output))
+
+    async def test_async_endpoints_under_asgi(self):
+        client = AsyncClient()
+        response = await client.get('/api/jobs?status=active')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in json.loads(response.content)['items']], [self.job2.id])
+        # Queries run through the async ORM are still instrumented
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+        response = await client.get(f'/api/jobs/{self.job2.id}')
+        self.assertEqual(
+            (await client.get(f'/api/jobs/{self.job2.id}', headers={"if-none-match": response['ETag']})).status_code, 304
+        )
+
+        job_data = {
+            "title": "Async Engineer", "company": "Loop Inc", "location": "Taipei, Taiwan",
+            "description": "Event loops...", "salary_range": "", "required_skills": ["Python"],
+            "posting_date": str(date.today()), "expiration_date": str(date.today() + timedelta(days=30)),
+        }
+        response = await client.post('/api/jobs', job_data, content_type='application/json')
+        job_id = json.loads(response.content)['id']
+        job_data['title'] = "Senior Async Engineer"
+        response = await client.put(f'/api/jobs/{job_id}', job_data, content_type='application/json')
+        self.assertEqual(json.loads(response.content)['title'], "Senior Async Engineer")
+        response = await client.delete(f'/api/jobs/{job_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(await Job.objects.filter(id=job_id).aexists())
+
+    def test_replica_routing(self):
+        databases = {**settings.DATABASES, 'replica1': settings.DATABASES['default']}
+        with self.settings(DATABASES=databases):
+            # Reads go to the primary unless the view opted in to replicas
+            self.assertEqual(Job.objects.all().db, 'default')
+            with read_replica():
+                self.assertEqual(Job.objects.all().db, 'replica1')
+                self.assertEqual(router.db_for_write(Job), 'default')
+            self.assertEqual(reads_from_replica(lambda: Job.objects.all().db)(), 'replica1')
+            self.assertFalse(router.allow_migrate('replica1', 'jobs'))
+        # Without replicas the marked views read from the primary
+        with read_replica():
+            self.assertEqual(Job.objects.all().db, 'default')
+
+    def test_cache_fills_read_primary(self):
+        databases = {**settings.DATABASES, 'replica1': settings.DATABASES['default']}
+        build = lambda: {"db": Job.objects.all().db}
+        with self.settings(DATABASES=databases), read_replica():
+            # What lands in the shared cache comes from the primary...
+            response = job_cache.cached_response("jobs:test:replica", "list", None, build)
+            self.assertEqual(json.loads(response.content), {"db": "default"})
+            self.assertEqual(job_cache.cached_value("jobs:test:replica:value", build), {"db": "default"})
+            self.assertEqual(Job.objects.all().db, 'replica1')
+            # ...while uncached responses keep reading the replica
+            with self.settings(JOBS_CACHE_TIMEOUT=0):
+                response = job_cache.cached_response("jobs:test:replica", "list", None, build)
+                self.assertEqual(json.loads(response.content), {"db": "replica1"})
+
     def test_get_job(self):
         # Test retrieving a single job
         response = self.client.get(f'/api/jobs/{self.job1.id}')
@@ -164,6 +614,77 @@ class JobAPITestCase(TestCase):
         data = json.loads(response.content)
         self.assertEqual(data['title'], "Senior Python Developer")
 
+    def test_responses_are_cached_and_invalidated(self):
+        misses = job_cache.counters['list_misses']
+        self.client.get('/api/jobs?status=active')
+        self.client.get(f'/api/jobs/{self.job2.id}')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/jobs?status=Active')  # same normalized query
+            detail = self.client.get(f'/api/jobs/{self.job2.id}')
+        self.assertEqual(job_cache.counters['list_misses'], misses + 1)
+        self.assertEqual(json.loads(response.content)['total'], 1)
+        self.assertEqual(json.loads(detail.content)['title'], "Frontend Developer")
+
+        # Writes through the API evict the detail entry and every listing
+        update_data = {
+            "title": "Senior Frontend Developer",
+            "company": self.job2.company,
+            "location": self.job2.location,
+            "description": self.job2.description,
+            "salary_range": self.job2.salary_range,
+            "required_skills": self.job2.required_skills,
+            "posting_date": date.today().isoformat(),
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat()
+        }
+        self.client.put(f'/api/jobs/{self.job2.id}', json.dumps(update_data), content_type='application/json')
+        detail = self.client.get(f'/api/jobs/{self.job2.id}')
+        self.assertEqual(json.loads(detail.content)['title'], "Senior Frontend Developer")
+        response = self.client.get('/api/jobs?status=active')
+        self.assertEqual(json.loads(response.content)['items'][0]['title'], "Senior Frontend Developer")
+
+        # So do status transitions
+        Job.objects.filter(id=self.job1.id).update(posting_date=date.today())
+        transition_job_statuses()
+        response = self.client.get('/api/jobs?status=active')
+        self.assertEqual(json.loads(response.content)['total'], 2)
+
+    def test_conditional_get_job(self):
+        response = self.client.get(f'/api/jobs/{self.job2.id}')
+        self.assertEqual(response.status_code, 200)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        # Revalidation is answered without touching the database
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/jobs/{self.job2.id}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        response = self.client.get(f'/api/jobs/{self.job2.id}', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # An update produces a new ETag
+        self.job2.title = "Senior Frontend Developer"
+        self.job2.save()
+        response = self.client.get(f'/api/jobs/{self.job2.id}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_list_jobs(self):
+        response = self.client.get('/api/jobs?location=Taipei')
+        etag = response['ETag']
+        response = self.client.get('/api/jobs?location=Taipei', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Listings are revalidated by ETag alone
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        # Other parameters get another ETag
+        self.assertNotEqual(self.client.get('/api/jobs?location=Taipei&page_size=1')['ETag'], etag)
+
+        # A delete changes it, even of a job that was not the newest
+        self.client.delete(f'/api/jobs/{self.job1.id}')
+        response = self.client.get('/api/jobs?location=Taipei', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['total'], 1)
+
     def test_create_job(self):
         # Test creating a new job
         job_data = {
@@ -185,6 +706,64 @@ class JobAPITestCase(TestCase):
         data = json.loads(response.content)
         self.assertEqual(data['title'], "Software Engineer")
 
+    def test_bulk_create_jobs(self):
+        job_data = {
+            "title": "Data Engineer",
+            "company": "Dell",
+            "location": "Taipei, Taiwan",
+            "description": "Bulk imported job...",
+            "salary_range": "70,000 - 100,000 TWD",
+            "required_skills": ["Python", "Spark"],
+            "posting_date": date.today().isoformat(),
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat()
+        }
+        future = dict(
+            job_data,
+            posting_date=(date.today() + timedelta(days=5)).isoformat(),
+            required_skills=['C#', 'say "hi"', 'back\\slash', 'a,b', '{x}'],
+            salary_range=""
+        )
+        missing = {k: v for k, v in job_data.items() if k != "title"}
+        too_long = dict(job_data, title="x" * 300)  # rejected by the database, not the schema
+        response = self.client.post(
+            '/api/jobs/bulk',
+            json.dumps([job_data, missing, future, too_long]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 2)
+        self.assertEqual([e['row'] for e in data['errors']], [1, 3])
+        self.assertIn("title", data['errors'][0]['error'])
+        self.assertEqual(
+            sorted(Job.objects.filter(title="Data Engineer").values_list("status", flat=True)),
+            ["active", "scheduled"]
+        )
+        scheduled = Job.objects.get(title="Data Engineer", status="scheduled")
+        self.assertEqual(scheduled.required_skills, future['required_skills'])
+        self.assertEqual(scheduled.salary_range, "")
+
+    def test_bulk_create_jobs_ndjson(self):
+        job_data = {
+            "title": "Streaming Engineer",
+            "company": "Dell",
+            "location": "Taipei, Taiwan",
+            "description": "Bulk imported job...",
+            "required_skills": [],
+            "posting_date": date.today().isoformat(),
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat()
+        }
+        body = "\n".join([json.dumps(job_data), "{not json", "", json.dumps(job_data)])
+        response = self.client.post('/api/jobs/bulk', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 2)
+        self.assertEqual([e['row'] for e in data['errors']], [1])
+        self.assertEqual(Job.objects.filter(title="Streaming Engineer").count(), 2)
+
+        response = self.client.post('/api/jobs/bulk', '{"title": "x"}', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
     def test_update_job(self):
         # Test updating an existing job
         update_data = {
@@ -211,3 +790,308 @@ class JobAPITestCase(TestCase):
         response = self.client.delete(f'/api/jobs/{self.job1.id}')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Job.objects.count(), 2)
+
+    def test_bulk_update_jobs(self):
+        # Expire every Taipei posting of "Tech" companies; company stays unchanged
+        payload = {
+            "filters": {"location": "Taipei", "company": "Tech"},
+            "changes": {"expire": True, "salary_range": "100k-150k USD", "company": "Other Inc"},
+        }
+        response = self.client.post('/api/jobs/bulk/update', payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {"updated": 2})
+        self.job1.refresh_from_db()
+        self.job3.refresh_from_db()
+        # job1 is posted tomorrow, so it stays scheduled; job3 kept its earlier expiration date
+        self.assertEqual((self.job1.status, self.job1.expiration_date), ("scheduled", date.today() - timedelta(days=1)))
+        self.assertEqual((self.job3.status, self.job3.expiration_date), ("expired", date.today() - timedelta(days=1)))
+        self.assertEqual((self.job1.salary_min, self.job1.salary_max, self.job1.currency), (100000, 150000, "USD"))
+        self.assertEqual(self.job1.company, "Tech Corp")
+
+        # Moving the dates recomputes the status from the new values
+        payload = {"ids": [self.job1.id, self.job3.id], "changes": {
+            "posting_date": str(date.today()), "expiration_date": str(date.today() + timedelta(days=10)),
+        }}
+        response = self.client.post('/api/jobs/bulk/update', payload, content_type='application/json')
+        self.assertEqual(json.loads(response.content), {"updated": 2})
+        self.assertEqual(Job.objects.filter(status="active").count(), 3)
+
+        # Listings reflect the update right away
+        response = self.client.get('/api/jobs?status=active')
+        self.assertEqual(json.loads(response.content)['total'], 3)
+
+        # A selector must narrow the jobs down and changes must be given
+        for payload in ({"changes": {"title": "x"}}, {"filters": {"page": 2}, "changes": {"title": "x"}},
+                        {"ids": [], "changes": {"title": "x"}}, {"ids": [self.job1.id], "changes": {}}):
+            response = self.client.post('/api/jobs/bulk/update', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete_jobs(self):
+        response = self.client.get('/api/jobs')
+        self.assertEqual(json.loads(response.content)['total'], 3)
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                '/api/jobs/bulk/delete', {"filters": {"search": "developer", "search_mode": "fulltext"}},
+                content_type='application/json',
+            )
+        self.assertEqual(json.loads(response.content), {"deleted": 2})
+        self.assertEqual(list(Job.objects.values_list('id', flat=True)), [self.job3.id])
+
+        response = self.client.post('/api/jobs/bulk/delete', {"ids": [self.job3.id, 999999]},
+                                    content_type='application/json')
+        self.assertEqual(json.loads(response.content), {"deleted": 1})
+        response = self.client.get('/api/jobs')
+        self.assertEqual(json.loads(response.content)['total'], 0)
+
+        response = self.client.post('/api/jobs/bulk/delete', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_job(self):
+        # Only the supplied columns are written; status is left alone without date changes
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.patch(f'/api/jobs/{self.job1.id}', {"title": "Lead Python Developer"},
+                                         content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual((data['title'], data['status'], data['company']), ("Lead Python Developer", "scheduled", "Tech Corp"))
+        update = next(q['sql'] for q in captured.captured_queries if q['sql'].startswith('UPDATE'))
+        self.assertNotIn('"description"', update)
+        self.assertNotIn('"status"', update)
+
+        # Changing a date recomputes the status from the stored other date
+        response = self.client.patch(f'/api/jobs/{self.job1.id}', {"posting_date": str(date.today()), "company": "X"},
+                                     content_type='application/json')
+        data = json.loads(response.content)
+        self.assertEqual((data['status'], data['company']), ("active", "Tech Corp"))
+        response = self.client.patch(f'/api/jobs/{self.job1.id}', {"salary_range": "NT$50k"},
+                                     content_type='application/json')
+        self.assertEqual(json.loads(response.content)['salary_min'], 50000)
+
+    def test_patch_job_optimistic_concurrency(self):
+        response = self.client.get(f'/api/jobs/{self.job2.id}')
+        etag, updated_at = response['ETag'], json.loads(response.content)['updated_at']
+
+        # The first writer holding the current version wins
+        response = self.client.patch(f'/api/jobs/{self.job2.id}', {"title": "First"},
+                                     content_type='application/json', headers={"if-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(self.client.get(f'/api/jobs/{self.job2.id}')['ETag'], etag)
+
+        # A second writer still holding the old version is rejected, by ETag or updated_at
+        response = self.client.patch(f'/api/jobs/{self.job2.id}', {"title": "Second"},
+                                     content_type='application/json', headers={"if-match": etag})
+        self.assertEqual(response.status_code, 412)
+        response = self.client.patch(f'/api/jobs/{self.job2.id}', {"title": "Second", "updated_at": updated_at},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 412)
+        self.job2.refresh_from_db()
+        self.assertEqual(self.job2.title, "First")
+
+        # The new version is accepted, and unknown jobs are 404s
+        response = self.client.patch(
+            f'/api/jobs/{self.job2.id}', {"title": "Second", "updated_at": self.job2.updated_at.isoformat()},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch('/api/jobs/999999', {"title": "x"}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_jobs(self):
+        # NDJSON, one job per line in listing order
+        response = self.client.get('/api/jobs/export?location=Taipei')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.job1.id, self.job3.id])
+        self.assertEqual(rows[0]['required_skills'], ["Python", "Django", "PostgreSQL"])
+
+        # CSV with a header row, projected to the requested fields
+        response = self.client.get('/api/jobs/export?format=csv&fields=title,required_skills&order_by=expiration_date')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="jobs.csv"')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,title,required_skills')
+        self.assertEqual(lines[1], f'{self.job3.id},DevOps Engineer,"Docker,Kubernetes,AWS"')
+        self.assertEqual(len(lines), 4)
+
+        response = self.client.get('/api/jobs/export?format=xml')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_export_jobs_under_asgi(self):
+        # Under ASGI the rows are streamed by an async iterator
+        response = await AsyncClient().get('/api/jobs/export?status=active')
+        self.assertTrue(response.is_async)
+        lines = [line async for chunk in response.streaming_content for line in chunk.splitlines()]
+        self.assertEqual([json.loads(line)['id'] for line in lines], [self.job2.id])
+
+    def test_list_jobs_page_size_is_capped(self):
+        with self.settings(JOBS_MAX_PAGE_SIZE=2):
+            # page_size=0 no longer returns everything once the jobs exceed one capped page
+            data = json.loads(self.client.get('/api/jobs?page_size=0').content)
+            self.assertEqual((len(data['items']), data['page_size'], data['total'], data['has_next']), (2, 2, 3, True))
+            data = json.loads(self.client.get('/api/jobs?page_size=500&page=2').content)
+            self.assertEqual((len(data['items']), data['page_size'], data['page']), (1, 2, 2))
+            data = json.loads(self.client.get('/api/jobs?pagination=cursor&page_size=500').content)
+            self.assertEqual(len(data['items']), 2)
+
+    def test_job_changes_feed(self):
+        # From the beginning every job is a create, in write order
+        data = json.loads(self.client.get('/api/jobs/changes').content)
+        self.assertEqual([(c['op'], c['id']) for c in data['changes']],
+                         [("create", self.job1.id), ("create", self.job2.id), ("create", self.job3.id)])
+        self.assertFalse(data['has_more'])
+        cursor = data['next_cursor']
+
+        # Nothing changed: same cursor back
+        data = json.loads(self.client.get(f'/api/jobs/changes?cursor={cursor}').content)
+        self.assertEqual((data['changes'], data['next_cursor']), ([], cursor))
+
+        # Updates, deletes (tombstones from any delete path) and creates after the cursor
+        self.client.patch(f'/api/jobs/{self.job1.id}', {"title": "Changed"}, content_type='application/json')
+        self.client.post('/api/jobs/bulk/delete', {"ids": [self.job2.id]}, content_type='application/json')
+        job4 = Job.objects.create(
+            title="Data Engineer", company="Data Co", location="Remote", description="Pipelines",
+            required_skills=["Python"], posting_date=date.today(), expiration_date=date.today() + timedelta(days=30),
+        )
+        data = json.loads(self.client.get(f'/api/jobs/changes?cursor={cursor}&limit=2').content)
+        self.assertEqual([(c['op'], c['id']) for c in data['changes']], [("update", self.job1.id), ("delete", self.job2.id)])
+        self.assertEqual(data['changes'][0]['job']['title'], "Changed")
+        self.assertIsNone(data['changes'][1]['job'])
+        self.assertTrue(data['has_more'])
+        data = json.loads(self.client.get(f"/api/jobs/changes?cursor={data['next_cursor']}").content)
+        self.assertEqual([(c['op'], c['id']) for c in data['changes']], [("create", job4.id)])
+
+        # Writes of a transaction that is still running (stamped with a newer
+        # transaction id, faked here with the triggers off) are held back until it
+        # ends, so it can never commit behind a cursor that passed them
+        with connection.cursor() as db:
+            db.execute("SET session_replication_role = replica")
+            db.execute("UPDATE jobs_job SET change_xid = pg_current_xact_id()::text::bigint + 1000 WHERE id = %s", [job4.id])
+            db.execute("RESET session_replication_role")
+        data = json.loads(self.client.get(f'/api/jobs/changes?cursor={cursor}').content)
+        self.assertEqual([c['id'] for c in data['changes']], [self.job1.id, self.job2.id])
+
+        # Nothing after a `since` start yet: the cursor resumes from that time
+        since = (date.today() + timedelta(days=1)).isoformat()
+        data = json.loads(self.client.get(f'/api/jobs/changes?since={since}').content)
+        self.assertEqual(data['changes'], [])
+        self.assertEqual(self.client.get(f"/api/jobs/changes?cursor={data['next_cursor']}").status_code, 200)
+
+        self.assertEqual(self.client.get('/api/jobs/changes?cursor=bogus').status_code, 400)
+        since = (date.today() - timedelta(days=365)).isoformat()
+        self.assertEqual(self.client.get(f'/api/jobs/changes?since={since}').status_code, 410)
+        # Streaming needs the ASGI server
+        self.assertEqual(self.client.get('/api/jobs/changes?stream=true').status_code, 400)
+
+    @override_settings(JOBS_CHANGES_STREAM_SECONDS=0)
+    async def test_job_changes_stream(self):
+        response = await AsyncClient().get('/api/jobs/changes', headers={"accept": "text/event-stream"})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        events = [dict(line.split(": ", 1) for line in block.splitlines())
+                  for block in body.strip().split("\n\n") if block.startswith("id:")]
+        self.assertEqual([(e['event'], json.loads(e['data'])['id']) for e in events],
+                         [("create", self.job1.id), ("create", self.job2.id), ("create", self.job3.id)])
+
+        # Reconnecting with Last-Event-ID resumes after that event
+        response = await AsyncClient().get('/api/jobs/changes?stream=true',
+                                           headers={"last-event-id": events[1]['id']})
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn(f'"id":{self.job3.id}', body)
+        self.assertNotIn(f'"id":{self.job2.id}', body)
+
+    def test_archive_jobs(self):
+        detail = json.loads(self.client.get(f'/api/jobs/{self.job3.id}').content)
+        cursor = json.loads(self.client.get('/api/jobs/changes').content)['next_cursor']
+
+        # Only jobs expired before the cutoff move; a rerun has nothing left to do
+        out = StringIO()
+        call_command('archive_jobs', days=0, batch_size=1, stdout=out)
+        self.assertIn('Archived 1 jobs', out.getvalue())
+        self.assertFalse(Job.objects.filter(id=self.job3.id).exists())
+        self.assertEqual(JobArchive.objects.get(id=self.job3.id).title, "DevOps Engineer")
+        call_command('archive_jobs', days=0, stdout=StringIO())
+        self.assertEqual(JobArchive.objects.count(), 1)
+
+        # Gone from the listings, still served by id (with the same validators)
+        self.assertEqual(json.loads(self.client.get('/api/jobs').content)['total'], 2)
+        response = self.client.get(f'/api/jobs/{self.job3.id}')
+        self.assertEqual(json.loads(response.content), detail)
+        response = self.client.get(f'/api/jobs/{self.job3.id}', headers={"if-none-match": response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/api/jobs/999999').status_code, 404)
+
+        # The change feed reports the move as an archive, not a delete
+        data = json.loads(self.client.get(f'/api/jobs/changes?cursor={cursor}').content)
+        self.assertEqual([(c['op'], c['id']) for c in data['changes']], [("archive", self.job3.id)])
+
+    def test_company_location_lookups(self):
+        # Names are stored once in the lookup tables; jobs hold integer keys
+        tech = Company.objects.get(name="Tech Corp")
+        taipei = Location.objects.get(name="Taipei, Taiwan")
+        self.assertEqual((self.job1.company_ref_id, self.job3.location_ref_id), (tech.id, taipei.id))
+        self.assertEqual(Location.objects.count(), 2)
+
+        # Exact match and prefix autocomplete
+        data = json.loads(self.client.get('/api/companies?name=Tech%20Corp').content)
+        self.assertEqual(data, [{"id": tech.id, "name": "Tech Corp"}])
+        self.assertEqual(json.loads(self.client.get('/api/companies?name=tech').content), [])
+        data = json.loads(self.client.get('/api/locations/autocomplete?prefix=tai').content)
+        self.assertEqual([item['name'] for item in data], ["Taipei, Taiwan"])
+        data = json.loads(self.client.get('/api/companies/autocomplete?prefix=c&limit=5').content)
+        self.assertEqual([item['name'] for item in data], ["Cloud Tech"])
+        self.assertEqual(self.client.get('/api/companies/autocomplete?prefix=%20').status_code, 400)
+        sql, params = Company.objects.filter(name__istartswith="ta").order_by("name").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql, params)
+            self.assertIn("company_name_prefix_idx", "\n".join(row[0] for row in cursor.fetchall()))
+
+        # Integer-key filters
+        data = json.loads(self.client.get(f'/api/jobs?company_id={tech.id}&fields=summary').content)
+        self.assertEqual([(item['id'], item['company']) for item in data['items']], [(self.job1.id, "Tech Corp")])
+        data = json.loads(self.client.get(f'/api/jobs?location_id={taipei.id}').content)
+        self.assertEqual(data['total'], 2)
+
+        # New names are added on write; the company still cannot be changed
+        payload = {
+            "title": self.job2.title, "company": "Other Inc", "location": "Remote",
+            "description": self.job2.description, "salary_range": self.job2.salary_range,
+            "required_skills": self.job2.required_skills,
+            "posting_date": str(self.job2.posting_date), "expiration_date": str(self.job2.expiration_date),
+        }
+        data = json.loads(self.client.put(f'/api/jobs/{self.job2.id}', payload, content_type='application/json').content)
+        self.assertEqual((data['company'], data['location']), ("Web Solutions", "Remote"))
+        self.assertFalse(Company.objects.filter(name="Other Inc").exists())
+        response = self.client.patch(f'/api/jobs/{self.job1.id}', {"location": "Hsinchu, Taiwan"},
+                                     content_type='application/json')
+        self.assertEqual(json.loads(response.content)['location'], "Hsinchu, Taiwan")
+        response = self.client.post('/api/jobs/bulk', [{**payload, "company": "New Co"}], content_type='application/json')
+        self.assertEqual(json.loads(response.content)['created'], 1)
+        self.assertEqual(Job.objects.get(company_ref__name="New Co").location, "Remote")
+        self.assertEqual(Location.objects.filter(name="Remote").count(), 1)
+
+    def test_similar_jobs(self):
+        similar = Job.objects.create(
+            title="Python Developer", company="Snake Co", location="Taipei, Taiwan",
+            description="Python and Django", salary_range="", required_skills=["python", "Django", "PostgreSQL"],
+            posting_date=date.today(), expiration_date=date.today() + timedelta(days=30),
+        )
+        # The buckets follow every write path through the jobs_job triggers
+        self.assertEqual(JobSimilarityBucket.objects.filter(job_id=similar.id).count(), 9)
+
+        data = json.loads(self.client.get(f'/api/jobs/{self.job1.id}/similar?status=').content)
+        self.assertEqual(data['items'][0]['id'], similar.id)
+        self.assertEqual(data['items'][0]['shared_skills'], ["python", "Django", "PostgreSQL"])
+        self.assertEqual(data['items'][0]['score'], 0.8571)  # 6 of 7 features shared, all but "senior"
+        self.assertNotIn(self.job1.id, [item['id'] for item in data['items']])
+        self.assertEqual(self.client.get('/api/jobs/999999/similar').status_code, 404)
+
+        # Changed skills move the job to other buckets; deleted jobs leave them
+        self.client.patch(f'/api/jobs/{similar.id}', {"title": "Mainframe Operator", "required_skills": ["COBOL"]},
+                          content_type='application/json')
+        data = json.loads(self.client.get(f'/api/jobs/{self.job1.id}/similar?status=').content)
+        self.assertNotIn(similar.id, [item['id'] for item in data['items'] if item['score'] > 0.5])
+        similar.delete()
+        self.assertFalse(JobSimilarityBucket.objects.filter(job_id=similar.id).exists())